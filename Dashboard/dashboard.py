@@ -397,6 +397,9 @@ def load_listing_by_id(listing_id: int) -> Optional[Dict[str, Any]]:
     }
 
 
+PROPERTY_ID_RE = re.compile(r"(?:id|listing|#)\s*(\d+)", re.IGNORECASE)
+
+
 def extract_property_ids_from_question(question: str) -> List[int]:
     """
     Versucht IDs aus der Frage zu ziehen, z.B.:
@@ -404,7 +407,7 @@ def extract_property_ids_from_question(question: str) -> List[int]:
     - "ID 12"
     - "listing #7"
     """
-    matches = re.findall(r"(?:id|listing|#)\s*(\d+)", question, flags=re.IGNORECASE)
+    matches = PROPERTY_ID_RE.findall(question)
 
     ids: List[int] = []
     for m in matches:
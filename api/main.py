@@ -8,6 +8,8 @@ from scraper.sources.rightmove_listings import (
     scrape_all_sync,
 )
 
+from scraper.sources.rightmove_scraper import LOOP_RUNNER
+
 # Analytics-Router
 from api.routes import analytics as analytics_routes
 
@@ -22,6 +24,12 @@ app.add_middleware(
 )
 
 
+@app.on_event("shutdown")
+def close_scraper_browser():
+    # warmer Pool-Browser lebt über Requests hinweg; beim Shutdown sauber schließen
+    LOOP_RUNNER.close()
+
+
 @app.get("/")
 def root():
     return {"status": "EstateAI API running"}
@@ -48,7 +48,7 @@ def capex_endpoint(payload: CapexRequest, db=Depends(get_session)):
 
 @router.get("/refurb/{property_id}")
 def refurb_scores(property_id: int, db=Depends(get_session)):
-    prop = db.query(Property).get(property_id)
+    prop = db.get(Property, property_id)
     if not prop:
         raise HTTPException(status_code=404, detail="Property not found")
 
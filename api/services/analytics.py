@@ -51,7 +51,7 @@ def estimate_capex_for_property(
     """
     Schätzt Capex für ein Property + optional neue Rendite nach Refurb.
     """
-    prop = db.query(Property).get(property_id)
+    prop = db.get(Property, property_id)
     if not prop:
         raise ValueError("Property not found")
 
@@ -0,0 +1,58 @@
+"""
+Out-of-band Ablage für große Rohdaten (body_text, HTML).
+
+Statt die Blobs inline in raw_scrapes zu speichern, landen sie
+gzip-komprimiert und content-adressiert im Dateisystem:
+
+    blobs/<sha[:2]>/<sha>.gz
+
+In der DB steht nur noch der relative Pfad + SHA-256. Gleicher Inhalt
+wird dadurch automatisch nur einmal geschrieben.
+"""
+
+import gzip
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Standard: blobs/ neben der estateai.db im Projektroot
+BLOB_DIR = Path(
+    os.getenv("ESTATEAI_BLOB_DIR", Path(__file__).resolve().parents[1] / "blobs")
+)
+
+
+def content_sha256(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def persist_blob(data: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Schreibt data nach blobs/ und gibt (relativer_pfad, sha256) zurück.
+    Existiert der Hash schon, wird nichts geschrieben (Dedup).
+    """
+    if not data:
+        return None, None
+
+    sha = content_sha256(data)
+    rel_path = f"{sha[:2]}/{sha}.gz"
+    target = BLOB_DIR / rel_path
+
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # erst temp-Datei, dann rename -> keine halben Blobs bei Abbruch
+        tmp = target.with_suffix(".tmp")
+        tmp.write_bytes(gzip.compress(data.encode("utf-8")))
+        tmp.replace(target)
+
+    return rel_path, sha
+
+
+def load_blob(rel_path: Optional[str]) -> Optional[str]:
+    """Gegenstück zu persist_blob(): liest einen Blob wieder als str."""
+    if not rel_path:
+        return None
+    target = BLOB_DIR / rel_path
+    if not target.exists():
+        return None
+    return gzip.decompress(target.read_bytes()).decode("utf-8")
@@ -0,0 +1,25 @@
+# database/bootstrap.py
+
+from database.connection import get_session
+from database.seed_benchmarks import seed_all_benchmarks
+
+# Einmal pro Prozess reicht: Tabellen legt schon init_db() beim Import von
+# database.connection an, hier kommen nur noch die Seeds dazu.
+_INITIALIZED = False
+
+
+def ensure_db_initialized() -> None:
+    """
+    Seedet die Benchmark-Tabellen (idempotent). Weitere Aufrufe im selben
+    Prozess sind No-Ops.
+    """
+    global _INITIALIZED
+    if _INITIALIZED:
+        return
+
+    with get_session() as session:
+        print(f"[DB] Using database URL: {session.get_bind().url}")
+        # idempotent: seed nur, wenn Tabellen leer sind
+        seed_all_benchmarks(session)
+
+    _INITIALIZED = True
@@ -1,14 +1,22 @@
+import atexit
+import os
 from contextlib import contextmanager
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex
 
-from .models import Base
+from .models import (
+    Base,
+    LISTING_PROPERTY_BACKFILL,
+    LISTING_PROPERTY_COLUMNS,
+    LISTING_PROPERTY_SYNC,
+)
 
-# SQLite-DB im Projektroot:
+# SQLite-DB im Projektroot (per ESTATEAI_DATABASE_URL überschreibbar, z.B. für Tests):
 DB_PATH = Path(__file__).resolve().parents[1] / "estateai.db"
-DATABASE_URL = f"sqlite:///{DB_PATH}"
+DATABASE_URL = os.getenv("ESTATEAI_DATABASE_URL", f"sqlite:///{DB_PATH}")
 
 # Engine bauen
 engine = create_engine(
@@ -18,6 +26,31 @@ engine = create_engine(
     connect_args={"check_same_thread": False},  # wichtig für SQLite + mehrere Threads
 )
 
+# SQLite-Tuning für den Ingest-Pfad: WAL statt Rollback-Journal, kein fsync
+# pro Commit (synchronous=NORMAL ist mit WAL crash-sicher), 64 MB Page-Cache.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    # SQLite prüft FKs nur, wenn man es pro Verbindung einschaltet
+    "PRAGMA foreign_keys=ON",
+)
+
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _conn_record) -> None:
+        cur = dbapi_conn.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cur.execute(pragma)
+        cur.close()
+
+    # Beim Schließen der letzten Verbindung checkpointet SQLite die -wal-Datei
+    # zurück in estateai.db – wichtig, weil der Workflow nur die .db committet.
+    atexit.register(engine.dispose)
+
 # SessionFactory
 SessionLocal = sessionmaker(
     bind=engine,
@@ -35,6 +68,52 @@ def init_db() -> None:
     from . import models  # noqa: F401 – stellt sicher, dass alle Models registriert sind
 
     Base.metadata.create_all(bind=engine)
+    _migrate_existing_tables()
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql(LISTING_PROPERTY_SYNC)
+
+
+# Indizes, die durch neuere ersetzt wurden
+_DROPPED_INDEXES = ("ix_listings_type_property",)
+
+
+def _migrate_existing_tables() -> None:
+    """
+    create_all() legt nur fehlende Tabellen an. Neue Spalten und Indizes
+    auf bereits bestehenden Tabellen (z.B. in der committeten estateai.db)
+    werden hier nachgezogen. SQLite kann ADD COLUMN – mehr brauchen wir nicht.
+    """
+    with engine.begin() as conn:
+        # Inspector auf derselben Verbindung: eine zweite Verbindung würde
+        # während der laufenden Schreib-Transaktion auf "database is locked" laufen
+        insp = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            added = set()
+            for col in table.columns:
+                if col.name in existing:
+                    continue
+                col_type = col.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(f"ALTER TABLE {table.name} ADD COLUMN {col.name} {col_type}")
+                )
+                added.add(col.name)
+
+            # neu denormalisierte Spalten einmalig aus properties befüllen
+            if table.name == "listings" and added & set(LISTING_PROPERTY_COLUMNS):
+                conn.execute(text(LISTING_PROPERTY_BACKFILL))
+
+            # IF NOT EXISTS statt checkfirst: Reflection sieht keine
+            # Ausdrucks-Indizes (z.B. uq_rent_benchmarks_bucket)
+            for idx in table.indexes:
+                conn.execute(CreateIndex(idx, if_not_exists=True))
+
+        for name in _DROPPED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
 
 
 @contextmanager
@@ -56,6 +135,19 @@ def get_session():
         session.close()
 
 
+@contextmanager
+def session_scope(session=None):
+    """
+    Wie get_session(), aber mit optional injizierter Session: ist eine
+    übergeben, gehört die Transaktion dem Aufrufer (kein Commit hier).
+    """
+    if session is not None:
+        yield session
+        return
+    with get_session() as own_session:
+        yield own_session
+
+
 # Optional: automatische Initialisierung beim Import
 # (kannst du lassen, weil es idempotent ist)
 init_db()
@@ -5,41 +5,64 @@ Ziel:
 - Scraper gibt ein dict zurück → hier wird es in die Pyramiden-DB gemappt.
 """
 
+import re
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, raiseload
 
 from . import models
+from .blobs import persist_blob
 
 
 # -------------------------------------------------------------
-# Helper: Preis-Parsing "£27,500,000" -> 27500000.0
+# Helper: Preis-/Int-Parsing (einzige Implementierung, auch für ingest.py)
 # -------------------------------------------------------------
-def parse_price_to_float(price_str: Optional[str]) -> Optional[float]:
-    if not price_str:
+_PRICE_NUMBER_RE = re.compile(r"[\d.]+")
+# führende Ganzzahl; danach keine weitere Ziffer, kein Dezimal-/Tausenderzeichen
+_INT_RE = re.compile(r"\s*([+-]?\d+)(?![\d.,])")
+
+
+def parse_price_to_float(price_str: Any) -> Optional[float]:
+    """
+    "£27,500,000" -> 27500000.0, "Guide price £1,250,000" -> 1250000.0,
+    bereits numerische Werte werden direkt übernommen.
+    """
+    if price_str is None or price_str == "":
         return None
+    if isinstance(price_str, (int, float)) and not isinstance(price_str, bool):
+        return float(price_str)
     try:
-        cleaned = price_str.replace("£", "").replace(",", "").strip()
+        cleaned = str(price_str).replace("£", "").replace(",", "")
         # Manche Rightmove-Strings enthalten noch "Guide price" etc.
-        digits = ""
-        for ch in cleaned:
-            if ch.isdigit() or ch == ".":
-                digits += ch
-            elif digits:
-                # break when non-digit after we already collected some digits
-                break
-        if not digits:
+        # -> erster zusammenhängender Block aus Ziffern/Punkt gewinnt
+        m = _PRICE_NUMBER_RE.search(cleaned)
+        if not m:
             return None
-        return float(digits)
+        return float(m.group(0))
     except Exception:
         return None
 
 
 def parse_int_safe(value: Any) -> Optional[int]:
+    """
+    10 -> 10, "10" -> 10, "-5" -> -5, "10 bedrooms" -> 10.
+    Strings müssen mit der Zahl beginnen; Dezimal- und Tausenderformen
+    ("3.5", "1,200") sowie Präfixe ("£1,234", "bed 3") geben None,
+    statt eine falsche Zahl zu raten.
+    """
     if value is None:
         return None
+    # Fast Paths für den Normalfall (int oder "10")
+    if type(value) is int:
+        return value
+    if isinstance(value, str):
+        if value.isdecimal():
+            return int(value)
+        m = _INT_RE.match(value)
+        return int(m.group(1)) if m else None
     try:
         return int(value)
     except Exception:
@@ -49,23 +72,46 @@ def parse_int_safe(value: Any) -> Optional[int]:
 # -------------------------------------------------------------
 # MARKETS & SUBMARKETS
 # -------------------------------------------------------------
+def _get_cached(session: Session, model, key: tuple):
+    """
+    Schon einmal in dieser Session aufgelöste PKs merken, damit
+    Folge-Lookups über session.get() aus der Identity-Map kommen
+    statt erneut ein SELECT abzusetzen.
+    """
+    cached = session.info.setdefault("pk_cache", {}).get((model, key))
+    if cached is None:
+        return None
+    pk, _obj = cached
+    return session.get(model, pk)
+
+
+def _remember_pk(session: Session, model, key: tuple, obj) -> None:
+    # Objekt mit ablegen: die Identity-Map hält nur schwache Referenzen
+    session.info.setdefault("pk_cache", {})[(model, key)] = (obj.id, obj)
+
+
 def get_or_create_market(
     session: Session,
     name: str,
     country: str = "UK",
     code: Optional[str] = None,
 ) -> models.Market:
+    key = (name, code)
+    market = _get_cached(session, models.Market, key)
+    if market:
+        return market
+
     stmt = select(models.Market).where(models.Market.name == name)
     if code:
         stmt = stmt.where(models.Market.code == code)
 
     market = session.execute(stmt).scalar_one_or_none()
-    if market:
-        return market
+    if not market:
+        market = models.Market(name=name, country=country, code=code)
+        session.add(market)
+        session.flush()  # assign id
 
-    market = models.Market(name=name, country=country, code=code)
-    session.add(market)
-    session.flush()  # assign id
+    _remember_pk(session, models.Market, key, market)
     return market
 
 
@@ -75,6 +121,11 @@ def get_or_create_submarket(
     name: str,
     postcode_prefix: Optional[str] = None,
 ) -> models.Submarket:
+    key = (market.id, name, postcode_prefix)
+    sub = _get_cached(session, models.Submarket, key)
+    if sub:
+        return sub
+
     stmt = select(models.Submarket).where(
         models.Submarket.market_id == market.id,
         models.Submarket.name == name,
@@ -83,19 +134,40 @@ def get_or_create_submarket(
         stmt = stmt.where(models.Submarket.postcode_prefix == postcode_prefix)
 
     sub = session.execute(stmt).scalar_one_or_none()
-    if sub:
-        return sub
+    if not sub:
+        sub = models.Submarket(
+            market_id=market.id,
+            name=name,
+            postcode_prefix=postcode_prefix,
+        )
+        session.add(sub)
+        session.flush()
 
-    sub = models.Submarket(
-        market_id=market.id,
-        name=name,
-        postcode_prefix=postcode_prefix,
-    )
-    session.add(sub)
-    session.flush()
+    _remember_pk(session, models.Submarket, key, sub)
     return sub
 
 
+# Bekannte Märkte: Stadtname in der Adresse -> Market-Stammdaten
+KNOWN_MARKETS: Dict[str, Dict[str, str]] = {
+    "London": {"name": "London", "country": "UK", "code": "LON"},
+}
+
+# Eine vorkompilierte Alternation statt einer Kette von `in`-Checks:
+# ein Durchlauf über die Adresse, egal wie viele Märkte dazukommen.
+_MARKET_RE = re.compile(
+    r"\b(" + "|".join(re.escape(name) for name in KNOWN_MARKETS) + r")\b"
+)
+
+
+def detect_market(address: Optional[str]) -> Optional[Dict[str, str]]:
+    if not address:
+        return None
+    m = _MARKET_RE.search(address)
+    if not m:
+        return None
+    return KNOWN_MARKETS[m.group(1)]
+
+
 # -------------------------------------------------------------
 # PROPERTY
 # -------------------------------------------------------------
@@ -113,7 +185,11 @@ def get_or_create_property(
     Identifiziert Properties aktuell primär über (full_address, postcode).
     Für Pitch reicht das. Später kann man hier Geo/Hashing ergänzen.
     """
-    stmt = select(models.Property).where(models.Property.full_address == full_address)
+    stmt = (
+        select(models.Property)
+        .where(models.Property.full_address == full_address)
+        .options(raiseload("*"))  # Write-Pfad: kein selectin auf listings
+    )
     if postcode:
         stmt = stmt.where(models.Property.postcode == postcode)
 
@@ -235,20 +311,19 @@ def upsert_listing_from_scrape(
         if len(candidate) <= 8:  # grobe Heuristik
             postcode = candidate or None
 
-    # Noch keine echte City-Erkennung – das kannst du später ausbauen
-    city = None
-
     # Property-Level-Infos vorbereiten
     bedrooms_int = parse_int_safe(scraped.get("bedrooms"))
     bathrooms_int = parse_int_safe(scraped.get("bathrooms"))
     property_type = scraped.get("property_type")
 
-    # Aktuell: Market/Submarket optional/leer – später kannst du hier Mapping bauen
+    # City/Market über die bekannten Märkte erkennen
+    city = None
     market = None
     submarket = None
-    # Beispiel: London-Hardcode
-    if "London" in address:
-        market = get_or_create_market(session, name="London", country="UK", code="LON")
+    market_info = detect_market(address)
+    if market_info:
+        city = market_info["name"]
+        market = get_or_create_market(session, **market_info)
         # Submarket könnte man über postcode machen (z.B. "W11")
         if postcode:
             submarket_name = f"{postcode} area"
@@ -274,58 +349,90 @@ def upsert_listing_from_scrape(
     price_float = parse_price_to_float(scraped.get("price"))
     description = scraped.get("description")
 
-    # Prüfen, ob es schon ein Listing für (property, url, portal) gibt
-    stmt = select(models.Listing).where(
-        models.Listing.property_id == prop.id,
-        models.Listing.url == url,
-        models.Listing.portal == portal,
-    )
-    listing = session.execute(stmt).scalar_one_or_none()
-
     now = datetime.utcnow()
 
-    if listing:
-        listing.price = price_float
-        listing.currency = "GBP"
-        listing.bedrooms = bedrooms_int
-        listing.bathrooms = bathrooms_int
-        listing.property_type = property_type or listing.property_type
-        listing.description = description or listing.description
-        listing.last_seen_at = now
-        if run:
-            listing.scrape_run_id = run.id
-    else:
-        listing = models.Listing(
-            property_id=prop.id,
-            scrape_run_id=run.id if run else None,
-            portal=portal,
-            external_id=None,  # könntest du später aus der URL parsen
-            url=url,
-            listing_type=listing_type,
-            status="active",
-            tenure=None,
-            price=price_float,
-            currency="GBP",
-            bedrooms=bedrooms_int,
-            bathrooms=bathrooms_int,
-            property_type=property_type,
-            scraped_at=now,
-            first_seen_at=now,
-            last_seen_at=now,
-            description=description,
-        )
-        session.add(listing)
-        session.flush()
-
-    # RawScrape optional speichern
+    # Upsert in einem Statement über den Unique-Index (url, portal, property_id):
+    # neu -> INSERT, vorhanden -> UPDATE, kein SELECT vorab.
+    insert_stmt = sqlite_insert(models.Listing).values(
+        property_id=prop.id,
+        scrape_run_id=run.id if run else None,
+        portal=portal,
+        external_id=None,  # könntest du später aus der URL parsen
+        url=url,
+        listing_type=listing_type,
+        status="active",
+        tenure=None,
+        price=price_float,
+        currency="GBP",
+        bedrooms=bedrooms_int,
+        bathrooms=bathrooms_int,
+        property_type=property_type,
+        city=prop.city,
+        submarket_id=prop.submarket_id,
+        floor_area_sqm=prop.floor_area_sqm,
+        scraped_at=now,
+        first_seen_at=now,
+        last_seen_at=now,
+        description=description,
+    )
+    excluded = insert_stmt.excluded
+    stmt = insert_stmt.on_conflict_do_update(
+        index_elements=["url", "portal", "property_id"],
+        set_={
+            "price": excluded.price,
+            "currency": excluded.currency,
+            "bedrooms": excluded.bedrooms,
+            "bathrooms": excluded.bathrooms,
+            # leere Werte überschreiben Bestehendes nicht
+            "property_type": func.coalesce(
+                func.nullif(excluded.property_type, ""), models.Listing.property_type
+            ),
+            "description": func.coalesce(
+                func.nullif(excluded.description, ""), models.Listing.description
+            ),
+            "last_seen_at": excluded.last_seen_at,
+            "scrape_run_id": func.coalesce(
+                excluded.scrape_run_id, models.Listing.scrape_run_id
+            ),
+        },
+    ).returning(models.Listing)
+
+    listing = session.scalars(
+        stmt, execution_options={"populate_existing": True}
+    ).one()
+
+    # RawScrape optional speichern (Volltext out-of-band unter blobs/)
     if raw_text or raw_meta:
-        raw = models.RawScrape(
-            listing_id=listing.id,
-            scraped_at=now,
-            raw_text=raw_text,
-            raw_meta=raw_meta,
+        raw_text_path, text_sha = persist_blob(raw_text)
+        insert_raw_scrapes(
+            session,
+            [
+                {
+                    "listing_id": listing.id,
+                    "scraped_at": now,
+                    "raw_text_path": raw_text_path,
+                    "content_sha256": text_sha,
+                    "raw_meta": raw_meta,
+                }
+            ],
         )
-        session.add(raw)
 
     session.flush()
     return listing
+
+
+# -------------------------------------------------------------
+# RAW_SCRAPES (Batch, dedupliziert über Content-Hash)
+# -------------------------------------------------------------
+def insert_raw_scrapes(session: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Schreibt RawScrape-Zeilen in einem executemany. Identischer Inhalt für
+    dasselbe Listing (listing_id, content_sha256) wird direkt von SQLite
+    verworfen – kein SELECT vorab nötig.
+    """
+    if not rows:
+        return
+    stmt = sqlite_insert(models.RawScrape).on_conflict_do_nothing(
+        index_elements=["listing_id", "content_sha256"],
+    )
+    session.execute(stmt, rows)
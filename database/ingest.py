@@ -1,51 +1,160 @@
 # database/ingest.py
 
-import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any, Tuple, Optional
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError, MultipleResultsFound
+from sqlalchemy.orm import joinedload, raiseload
 
-from database.connection import get_session
+from database.connection import session_scope
 from database import models
+from database.blobs import persist_blob
+from database.crud import insert_raw_scrapes, parse_int_safe, parse_price_to_float
 
 
 # ----------------------------------------------------------
-# Helper: Parsing / Normalisierung
+# Helper: Parsing / Normalisierung (Parser selbst leben in crud.py)
 # ----------------------------------------------------------
 
-def _parse_price(price_raw: Any) -> Optional[float]:
+def _preprocess_row(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
-    Erwartet z.B.:
-    - '£18,000,000'
-    - '18000000'
-    - None
-    und gibt float oder None zurück.
+    Reines CPU-Parsing eines Scraper-Dicts (keine DB, keine ORM-Objekte).
+    Gibt nur primitive Werte zurück, damit das Ergebnis picklebar ist und
+    in einem ProcessPool laufen kann. None = Zeile ohne URL.
     """
-    if price_raw is None:
+    url = row.get("url")
+    if not url:
         return None
 
-    s = str(price_raw)
-    s = re.sub(r"[^\d\.]", "", s)
-    if not s:
-        return None
+    title = row.get("title")
+    description = row.get("description") or ""
 
-    try:
-        return float(s)
-    except Exception:
-        return None
+    return {
+        "url": url,
+        "price": parse_price_to_float(row.get("price")),
+        "bedrooms": parse_int_safe(row.get("bedrooms")),
+        "bathrooms": parse_int_safe(row.get("bathrooms")),
+        "floor_area_sqm": row.get("floor_area_sqm"),
+        "year_built": row.get("year_built"),
+        "energy_rating": row.get("energy_rating"),
+        "refurb_intensity": row.get("refurb_intensity"),
+        "address": row.get("address") or title or url,
+        "description": description,
+        "property_type": row.get("property_type"),
+        "raw_text": row.get("raw_text") or description,
+        "raw_html": row.get("raw_html"),
+        "raw_meta": row.get("raw_meta"),
+    }
 
 
-def _parse_int(value: Any) -> Optional[int]:
-    if value is None:
-        return None
-    s = re.sub(r"[^\d]", "", str(value))
-    if not s:
-        return None
-    try:
-        return int(s)
-    except Exception:
-        return None
+# Ab dieser Batch-Größe lohnt sich der Start eines ProcessPools
+PARALLEL_PREPROCESS_THRESHOLD = 5000
+
+
+def _preprocess_rows(results: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    if len(results) < PARALLEL_PREPROCESS_THRESHOLD:
+        return [_preprocess_row(r) for r in results]
+
+    with ProcessPoolExecutor() as ex:
+        return list(ex.map(_preprocess_row, results, chunksize=256))
+
+
+# Zeilen pro Bulk-INSERT (executemany); alles läuft in einer Transaktion
+INGEST_BATCH_SIZE = 1000
+
+
+def _bulk_insert_returning(
+    session,
+    model,
+    key_column,
+    rows: List[Dict[str, Any]],
+) -> Dict[Any, int]:
+    """
+    INSERT ... RETURNING in Batches von INGEST_BATCH_SIZE, jeweils in einem
+    Savepoint. Scheitert ein Batch an einem Constraint, wird er Zeile für
+    Zeile wiederholt, damit ein kaputter Datensatz nicht den ganzen Batch
+    kippt. Gibt {key_column-Wert: id} der erfolgreich geschriebenen Zeilen zurück.
+    """
+    ids: Dict[Any, int] = {}
+    stmt = insert(model).returning(model.id, key_column)
+
+    for start in range(0, len(rows), INGEST_BATCH_SIZE):
+        chunk = rows[start:start + INGEST_BATCH_SIZE]
+        try:
+            with session.begin_nested():
+                batch_ids = {key: pk for pk, key in session.execute(stmt, chunk)}
+            ids.update(batch_ids)
+        except IntegrityError:
+            for row in chunk:
+                try:
+                    with session.begin_nested():
+                        pk, key = session.execute(stmt, [row]).one()
+                    ids[key] = pk
+                except IntegrityError:
+                    continue
+
+    return ids
+
+
+# Werte pro IN-Liste beim Vorab-Laden (unter SQLites Variablen-Limit)
+PREFETCH_CHUNK_SIZE = 500
+
+# Marker für Schlüssel mit mehreren Treffern (url/full_address sind nicht unique)
+_AMBIGUOUS = object()
+
+
+def _prefetch_by(session, model, key_column, keys, *options) -> Dict[Any, Any]:
+    """
+    Lädt alle Zeilen mit key_column IN keys in wenigen Queries statt einem
+    SELECT pro Scraper-Zeile. Gibt {schlüssel: objekt} zurück; Schlüssel mit
+    mehr als einem Treffer zeigen auf _AMBIGUOUS.
+    """
+    found: Dict[Any, Any] = {}
+    keys = list(keys)
+    for start in range(0, len(keys), PREFETCH_CHUNK_SIZE):
+        chunk = keys[start:start + PREFETCH_CHUNK_SIZE]
+        stmt = select(model).where(key_column.in_(chunk)).options(*options)
+        for obj in session.execute(stmt).unique().scalars():
+            key = getattr(obj, key_column.key)
+            found[key] = _AMBIGUOUS if key in found else obj
+    return found
+
+
+def _prefetched(found: Dict[Any, Any], key: Any):
+    """Wie scalar_one_or_none() auf dem Vorab-Ergebnis."""
+    obj = found.get(key)
+    if obj is _AMBIGUOUS:
+        raise MultipleResultsFound(f"multiple rows for {key!r}")
+    return obj
+
+
+# ----------------------------------------------------------
+# ScrapeRun: ein Eintrag pro Scrape-Lauf, auch wenn in Batches ingestet wird
+# ----------------------------------------------------------
+
+def start_scrape_run(session, portal: str, location_query: str) -> models.ScrapeRun:
+    """Legt einen ScrapeRun (status='running') an und holt seine ID."""
+    scrape_run = models.ScrapeRun(
+        portal=portal,
+        location_query=location_query,
+        started_at=datetime.utcnow(),
+        status="running",
+        total_listings=0,
+        success_count=0,
+        error_count=0,
+    )
+    session.add(scrape_run)
+    session.flush()  # ID holen
+    return scrape_run
+
+
+def finish_scrape_run(session, scrape_run: models.ScrapeRun) -> None:
+    """Schließt einen Lauf ab; Status aus den aufsummierten Zählern."""
+    scrape_run.finished_at = datetime.utcnow()
+    scrape_run.status = "success" if not scrape_run.error_count else "completed_with_errors"
+    session.flush()
 
 
 # ----------------------------------------------------------
@@ -57,6 +166,8 @@ def ingest_bulk_results(
     portal: str,
     location_query: str,
     listing_type: str = "sale",
+    session=None,
+    scrape_run: Optional[models.ScrapeRun] = None,
 ) -> Tuple[int, int, int]:
     """
     Nimmt die Output-Liste deines Scrapers (rightmove_scraper.scrape_all_sync)
@@ -66,50 +177,114 @@ def ingest_bulk_results(
     - Listing
     - RawScrape
 
+    Ablauf: (1) Parsing aller Zeilen vorab (bei großen Batches parallel),
+    (2) ein einzelner DB-Writer, der nur noch DB-Arbeit macht.
+
+    session: optional von außen; dann committet der Aufrufer (z.B. ein
+    Commit für den ganzen Nightly-Lauf), sonst eigene Session + Commit.
+
+    scrape_run: optional ein laufender ScrapeRun (start_scrape_run()), wenn
+    ein Lauf in mehreren Batches ingestet wird. Die Zähler werden dann nur
+    aufaddiert; abschließen muss der Aufrufer (finish_scrape_run()).
+    Ohne scrape_run bekommt dieser Aufruf einen eigenen, fertigen Lauf.
+
     Gibt zurück: (total, success, error)
     """
     total = len(results)
     success = 0
     error = 0
 
-    with get_session() as session:
-        # ---------- ScrapeRun anlegen ----------
-        scrape_run = models.ScrapeRun(
-            portal=portal,
-            location_query=location_query,
-            started_at=datetime.utcnow(),
-            status="running",
-            total_listings=total,
+    cleaned_rows = _preprocess_rows(results)
+
+    # Ein Zeitstempel für den ganzen Batch statt utcnow() pro Zeile und Spalte;
+    # explizit gesetzt, damit die Spalten-Defaults beim Bulk-INSERT nicht feuern
+    now = datetime.utcnow()
+
+    with session_scope(session) as session:
+        # ---------- ScrapeRun anlegen bzw. fortführen ----------
+        own_run = scrape_run is None
+        if own_run:
+            scrape_run = start_scrape_run(session, portal, location_query)
+
+        # Bestehende Listings/Properties des Batches vorab laden
+        valid_rows = [r for r in cleaned_rows if r is not None]
+        # Property direkt mitladen (m:1 -> JOIN), alles andere darf
+        # nicht nachgeladen werden
+        existing_listings = _prefetch_by(
+            session,
+            models.Listing,
+            models.Listing.url,
+            {r["url"] for r in valid_rows},
+            joinedload(models.Listing.property),
+            raiseload("*"),
+        )
+        existing_properties = _prefetch_by(
+            session,
+            models.Property,
+            models.Property.full_address,
+            {r["address"] for r in valid_rows},
+            raiseload("*"),
         )
-        session.add(scrape_run)
-        session.flush()  # ID holen
 
-        for row in results:
-            url = row.get("url")
-            if not url:
+        # Neue Zeilen werden gesammelt und am Ende als Bulk-INSERT geschrieben;
+        # der ORM-Pfad (Identity-Map, Change-Tracking) bleibt nur für Updates.
+        new_properties: Dict[str, Dict[str, Any]] = {}   # full_address -> Property-Mapping
+        new_listings: Dict[str, Dict[str, Any]] = {}     # url -> Listing-Mapping
+        pending: List[Tuple[str, Optional[str], Dict[str, Any]]] = []  # (url, neue Adresse, RawScrape-Teil)
+        # url -> Property des vorgemerkten Listings (Mapping aus new_properties
+        # oder bestehendes ORM-Objekt), damit Duplikate dessen Lücken füllen
+        listing_props: Dict[str, Any] = {}
+
+        for row in cleaned_rows:
+            if row is None:
                 error += 1
                 continue
 
             try:
-                # --------- numerische Felder parsen ---------
-                price = _parse_price(row.get("price"))
-                bedrooms = _parse_int(row.get("bedrooms"))
-                bathrooms = _parse_int(row.get("bathrooms"))
-
-                floor_area_sqm = row.get("floor_area_sqm")
-                year_built = row.get("year_built")
-                energy_rating = row.get("energy_rating")
-                refurb_intensity = row.get("refurb_intensity")
-
-                title = row.get("title")
-                address = row.get("address") or title or url
-                description = row.get("description") or ""
-                property_type = row.get("property_type")
+                url = row["url"]
+                price = row["price"]
+                bedrooms = row["bedrooms"]
+                bathrooms = row["bathrooms"]
+
+                floor_area_sqm = row["floor_area_sqm"]
+                year_built = row["year_built"]
+                energy_rating = row["energy_rating"]
+                refurb_intensity = row["refurb_intensity"]
+
+                address = row["address"]
+                description = row["description"]
+                property_type = row["property_type"]
+
+                # --------- Duplikat innerhalb des Batches ---------
+                pending_listing = new_listings.get(url)
+                if pending_listing is not None:
+                    if price is not None:
+                        pending_listing["price"] = price
+                    if bedrooms is not None:
+                        pending_listing["bedrooms"] = bedrooms
+                    if bathrooms is not None:
+                        pending_listing["bathrooms"] = bathrooms
+
+                    # Property ergänzen wie beim bestehenden Listing unten
+                    prop = listing_props.get(url)
+                    for key, value in (
+                        ("floor_area_sqm", floor_area_sqm),
+                        ("year_built", year_built),
+                        ("energy_rating", energy_rating or None),
+                        ("refurb_intensity", refurb_intensity or None),
+                    ):
+                        if value is None:
+                            continue
+                        if isinstance(prop, dict):
+                            if not prop[key]:
+                                prop[key] = value
+                        elif prop is not None and not getattr(prop, key):
+                            setattr(prop, key, value)
+                    success += 1
+                    continue
 
                 # --------- Duplikat-Check nach URL ---------
-                existing_listing = session.execute(
-                    select(models.Listing).where(models.Listing.url == url)
-                ).scalar_one_or_none()
+                existing_listing = _prefetched(existing_listings, url)
 
                 if existing_listing:
                     # Listing updaten
@@ -119,8 +294,8 @@ def ingest_bulk_results(
                         existing_listing.bedrooms = bedrooms
                     if bathrooms is not None:
                         existing_listing.bathrooms = bathrooms
-                    existing_listing.last_seen_at = datetime.utcnow()
-                    existing_listing.scrape_run = scrape_run
+                    existing_listing.last_seen_at = now
+                    existing_listing.scrape_run_id = scrape_run.id
 
                     # Property ergänzen
                     prop = existing_listing.property
@@ -133,101 +308,173 @@ def ingest_bulk_results(
                             prop.energy_rating = energy_rating
                         if refurb_intensity and not prop.refurb_intensity:
                             prop.refurb_intensity = refurb_intensity
-                        prop.last_seen_at = datetime.utcnow()
+                        prop.last_seen_at = now
 
                     success += 1
                     continue
 
                 # --------- Property finden oder neu anlegen ---------
-                existing_property = session.execute(
-                    select(models.Property).where(models.Property.full_address == address)
-                ).scalar_one_or_none()
-
-                if existing_property:
-                    prop = existing_property
-                    if property_type and not prop.property_type:
-                        prop.property_type = property_type
-                    if bedrooms is not None and not prop.bedrooms:
-                        prop.bedrooms = bedrooms
-                    if bathrooms is not None and not prop.bathrooms:
-                        prop.bathrooms = bathrooms
-                    if floor_area_sqm is not None and not prop.floor_area_sqm:
-                        prop.floor_area_sqm = floor_area_sqm
-                    if year_built is not None and not prop.year_built:
-                        prop.year_built = year_built
-                    if energy_rating and not prop.energy_rating:
-                        prop.energy_rating = energy_rating
-                    if refurb_intensity and not prop.refurb_intensity:
-                        prop.refurb_intensity = refurb_intensity
-
-                    prop.last_seen_at = datetime.utcnow()
-
+                property_id = None
+                new_address = None
+                listing_prop = None
+
+                pending_property = new_properties.get(address)
+                if pending_property is not None:
+                    # schon in diesem Batch neu angelegt -> nur Lücken füllen
+                    for key, value in (
+                        ("property_type", property_type),
+                        ("bedrooms", bedrooms),
+                        ("bathrooms", bathrooms),
+                        ("floor_area_sqm", floor_area_sqm),
+                        ("year_built", year_built),
+                        ("energy_rating", energy_rating),
+                        ("refurb_intensity", refurb_intensity),
+                    ):
+                        if value is not None and not pending_property[key]:
+                            pending_property[key] = value
+                    new_address = address
+                    listing_prop = pending_property
                 else:
-                    # Neues Property
-                    prop = models.Property(
-                        full_address=address,
-                        postcode=None,
-                        city=None,
-                        property_type=property_type,
-                        bedrooms=bedrooms,
-                        bathrooms=bathrooms,
-                        floor_area_sqm=floor_area_sqm,
-                        year_built=year_built,
-                        is_new_build=False,
-                        energy_rating=energy_rating,
-                        refurb_intensity=refurb_intensity,
+                    existing_property = _prefetched(existing_properties, address)
+
+                    if existing_property:
+                        prop = existing_property
+                        if property_type and not prop.property_type:
+                            prop.property_type = property_type
+                        if bedrooms is not None and not prop.bedrooms:
+                            prop.bedrooms = bedrooms
+                        if bathrooms is not None and not prop.bathrooms:
+                            prop.bathrooms = bathrooms
+                        if floor_area_sqm is not None and not prop.floor_area_sqm:
+                            prop.floor_area_sqm = floor_area_sqm
+                        if year_built is not None and not prop.year_built:
+                            prop.year_built = year_built
+                        if energy_rating and not prop.energy_rating:
+                            prop.energy_rating = energy_rating
+                        if refurb_intensity and not prop.refurb_intensity:
+                            prop.refurb_intensity = refurb_intensity
+
+                        prop.last_seen_at = now
+                        property_id = prop.id
+                        listing_prop = prop
+
+                    else:
+                        # Neues Property (ID kommt erst beim Bulk-INSERT)
+                        new_properties[address] = {
+                            "full_address": address,
+                            "postcode": None,
+                            "city": None,
+                            "property_type": property_type,
+                            "bedrooms": bedrooms,
+                            "bathrooms": bathrooms,
+                            "floor_area_sqm": floor_area_sqm,
+                            "year_built": year_built,
+                            "is_new_build": False,
+                            "energy_rating": energy_rating,
+                            "refurb_intensity": refurb_intensity,
+                            "first_seen_at": now,
+                            "last_seen_at": now,
+                        }
+                        new_address = address
+                        listing_prop = new_properties[address]
+
+                # --------- Listing vormerken ---------
+                listing_props[url] = listing_prop
+                new_listings[url] = {
+                    "property_id": property_id,
+                    "scrape_run_id": scrape_run.id,
+                    "portal": portal,
+                    "external_id": None,
+                    "url": url,
+                    "listing_type": listing_type,
+                    "status": "active",
+                    "tenure": None,
+                    "price": price,
+                    "currency": "GBP",
+                    "bedrooms": bedrooms,
+                    "bathrooms": bathrooms,
+                    "property_type": property_type,
+                    "description": description,
+                    "scraped_at": now,
+                    "first_seen_at": now,
+                    "last_seen_at": now,
+                }
+
+                # --------- RawScrape vorbereiten (Blobs out-of-band) ---------
+                raw_text_path, text_sha = persist_blob(row["raw_text"])
+                raw_html_path, _ = persist_blob(row["raw_html"])
+
+                pending.append(
+                    (
+                        url,
+                        new_address,
+                        {
+                            "scraped_at": now,
+                            "raw_text_path": raw_text_path,
+                            "raw_html_path": raw_html_path,
+                            "content_sha256": text_sha,
+                            "raw_meta": row["raw_meta"],
+                        },
                     )
-                    session.add(prop)
-                    session.flush()  # ID holen
-
-                # --------- Listing anlegen ---------
-                listing = models.Listing(
-                    property_id=prop.id,
-                    scrape_run_id=scrape_run.id,
-                    portal=portal,
-                    external_id=None,
-                    url=url,
-                    listing_type=listing_type,
-                    status="active",
-                    tenure=None,
-                    price=price,
-                    currency="GBP",
-                    bedrooms=bedrooms,
-                    bathrooms=bathrooms,
-                    property_type=property_type,
-                    description=description,
-                    first_seen_at=datetime.utcnow(),
-                    last_seen_at=datetime.utcnow(),
                 )
-                session.add(listing)
-                session.flush()
-
-                # --------- RawScrape speichern ---------
-                raw_text = row.get("raw_text") or description
-                raw_html = row.get("raw_html")
-                raw_meta = row.get("raw_meta")
-
-                raw = models.RawScrape(
-                    listing_id=listing.id,
-                    scraped_at=datetime.utcnow(),
-                    raw_text=raw_text,
-                    raw_html=raw_html,
-                    raw_meta=raw_meta,
-                )
-                session.add(raw)
 
                 success += 1
 
             except Exception:
                 error += 1
 
-        # ScrapeRun finalisieren
-        scrape_run.finished_at = datetime.utcnow()
-        scrape_run.success_count = success
-        scrape_run.error_count = error
-        scrape_run.status = "success" if error == 0 else "completed_with_errors"
-
-        session.commit()
+        # --------- Bulk-INSERTs: Properties -> Listings -> RawScrapes ---------
+        property_ids: Dict[str, int] = {}
+        if new_properties:
+            property_ids = _bulk_insert_returning(
+                session,
+                models.Property,
+                models.Property.full_address,
+                list(new_properties.values()),
+            )
+
+        raw_rows: List[Dict[str, Any]] = []
+        if new_listings:
+            insertable: List[Dict[str, Any]] = []
+            for url, new_address, _ in pending:
+                listing_row = new_listings[url]
+                if new_address is not None:
+                    if new_address not in property_ids:
+                        continue  # Property-INSERT gescheitert
+                    listing_row["property_id"] = property_ids[new_address]
+                # Gespiegelte Property-Spalten erst jetzt übernehmen: spätere
+                # Zeilen im Batch können die Property noch ergänzt haben, und
+                # der Sync-Trigger feuert beim Autoflush vor diesem INSERT
+                prop = listing_props[url]
+                for col in models.LISTING_PROPERTY_COLUMNS:
+                    if isinstance(prop, dict):
+                        listing_row[col] = prop.get(col)
+                    else:
+                        listing_row[col] = getattr(prop, col, None)
+                insertable.append(listing_row)
+
+            listing_ids = _bulk_insert_returning(
+                session, models.Listing, models.Listing.url, insertable
+            )
+
+            for url, _, raw in pending:
+                if url in listing_ids:
+                    raw_rows.append({"listing_id": listing_ids[url], **raw})
+                else:
+                    success -= 1
+                    error += 1
+
+        for start in range(0, len(raw_rows), INGEST_BATCH_SIZE):
+            insert_raw_scrapes(session, raw_rows[start:start + INGEST_BATCH_SIZE])
+
+        # ScrapeRun fortschreiben (eigener Lauf: gleich abschließen)
+        scrape_run.total_listings = (scrape_run.total_listings or 0) + total
+        scrape_run.success_count = (scrape_run.success_count or 0) + success
+        scrape_run.error_count = (scrape_run.error_count or 0) + error
+        if own_run:
+            finish_scrape_run(session, scrape_run)
+        else:
+            session.flush()
 
     return total, success, error
 
@@ -20,8 +20,10 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Text,
+    Index,
 )
 from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy.sql import func, literal_column
 
 # WICHTIG: Base kommt NICHT mehr aus connection.py,
 # sondern wird hier direkt definiert.
@@ -76,6 +78,9 @@ class Submarket(Base):
 # --------------------------------------
 class Property(Base):
     __tablename__ = "properties"
+    __table_args__ = (
+        Index("ix_properties_city_submarket", "city", "submarket_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     submarket_id = Column(Integer, ForeignKey("submarkets.id"), nullable=True)
@@ -108,10 +113,13 @@ class Property(Base):
     last_seen_at = Column(DateTime, default=datetime.utcnow)
 
     submarket = relationship("Submarket", back_populates="properties")
+    # selectin: beim Lesen mehrerer Properties ein IN-Query statt N+1;
+    # der Ingest-Pfad schaltet das per raiseload("*") ab
     listings = relationship(
         "Listing",
         back_populates="property",
         cascade="all, delete-orphan",
+        lazy="selectin",
     )
 
     def __repr__(self):
@@ -123,6 +131,23 @@ class Property(Base):
 # --------------------------------------
 class Listing(Base):
     __tablename__ = "listings"
+    __table_args__ = (
+        # url vorne: deckt auch den reinen URL-Lookup im Ingest ab
+        Index("uq_listings_url_portal_property", "url", "portal", "property_id", unique=True),
+        # Rent-Benchmark-Aggregation: Filter auf listing_type, dann die
+        # Bucket-Spalten in Partition-Reihenfolge, price/m² mit drin
+        # -> Index-only-Scan auf listings, kein JOIN
+        Index(
+            "ix_listings_rent_bucket",
+            "listing_type", "city", "submarket_id", "bedrooms", "property_type",
+            "price", "floor_area_sqm",
+        ),
+        # FK-Lookups (Sync-Trigger unten, ON DELETE-Prüfung)
+        Index("ix_listings_property_id", "property_id"),
+        # "Top N nach Preis" (show_data.py): rückwärts über den Index statt
+        # Full Scan + Temp-B-Tree-Sort über alle Listings
+        Index("ix_listings_price", "price"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     property_id = Column(Integer, ForeignKey("properties.id"), nullable=False)
@@ -143,6 +168,12 @@ class Listing(Base):
     bathrooms = Column(Integer, nullable=True)
     property_type = Column(String(50), nullable=True)
 
+    # Denormalisiert aus Property (für Aggregationen ohne JOIN). Beim Insert
+    # setzt der Schreibpfad die Werte, danach hält LISTING_PROPERTY_SYNC sie aktuell.
+    city = Column(String(100), nullable=True)
+    submarket_id = Column(Integer, ForeignKey("submarkets.id"), nullable=True)
+    floor_area_sqm = Column(Float, nullable=True)
+
     scraped_at = Column(DateTime, default=datetime.utcnow)
     first_seen_at = Column(DateTime, default=datetime.utcnow)
     last_seen_at = Column(DateTime, default=datetime.utcnow)
@@ -161,19 +192,50 @@ class Listing(Base):
         return f"<Listing id={self.id} portal={self.portal} url={self.url!r}>"
 
 
+# Property-Spalten, die auf listings gespiegelt werden
+LISTING_PROPERTY_COLUMNS = ("city", "submarket_id", "floor_area_sqm")
+
+_sync_set = ", ".join(
+    f"{col} = (SELECT {col} FROM properties WHERE properties.id = listings.property_id)"
+    for col in LISTING_PROPERTY_COLUMNS
+)
+
+# Ändert sich eine gespiegelte Spalte an der Property, ziehen alle ihre
+# Listings nach (egal über welchen Schreibpfad das Update kam).
+LISTING_PROPERTY_SYNC = (
+    "CREATE TRIGGER IF NOT EXISTS trg_properties_sync_listings "
+    f"AFTER UPDATE OF {', '.join(LISTING_PROPERTY_COLUMNS)} ON properties "
+    f"BEGIN UPDATE listings SET {_sync_set} WHERE property_id = NEW.id; END"
+)
+
+# Einmaliges Befüllen, nachdem die Spalten per Migration dazukamen
+LISTING_PROPERTY_BACKFILL = f"UPDATE listings SET {_sync_set}"
+
+
 # --------------------------------------
 # 5. RAW_SCRAPES (Rohdaten & Debug)
 # --------------------------------------
 class RawScrape(Base):
     __tablename__ = "raw_scrapes"
+    __table_args__ = (
+        # gleicher Inhalt für dasselbe Listing nur einmal (INSERT ... ON CONFLICT DO NOTHING)
+        Index("uq_raw_scrapes_listing_sha256", "listing_id", "content_sha256", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     listing_id = Column(Integer, ForeignKey("listings.id"), nullable=False)
 
     scraped_at = Column(DateTime, default=datetime.utcnow)
 
-    raw_text = Column(Text, nullable=True)   # Volltext (z.B. body_text)
-    raw_html = Column(Text, nullable=True)   # optional: HTML, wenn du willst
+    # Große Blobs liegen out-of-band unter blobs/ (siehe database/blobs.py),
+    # hier stehen nur Pfad + Hash.
+    raw_text_path = Column(String(100), nullable=True)
+    raw_html_path = Column(String(100), nullable=True)
+    content_sha256 = Column(String(64), nullable=True, index=True)
+
+    # Legacy: Alt-Daten vor der Blob-Ablage, wird nicht mehr befüllt
+    raw_text = Column(Text, nullable=True)
+    raw_html = Column(Text, nullable=True)
     raw_meta = Column(Text, nullable=True)   # optional: JSON-String mit Meta
 
     listing = relationship("Listing", back_populates="raw_scrapes")
@@ -290,3 +352,15 @@ class RentBenchmark(Base):
 
     def __repr__(self):
         return f"<RentBenchmark id={self.id} city={self.city!r} bedrooms={self.bedrooms}>"
+
+
+# Bucket-Identität für den Upsert in build_rent_benchmarks. NULL-Werte werden
+# per COALESCE normalisiert, weil NULLs in SQLite-Unique-Indizes nie kollidieren.
+RENT_BENCHMARK_BUCKET = (
+    RentBenchmark.country,
+    RentBenchmark.city,
+    func.coalesce(RentBenchmark.submarket_id, literal_column("-1")),
+    func.coalesce(RentBenchmark.bedrooms, literal_column("-1")),
+    func.coalesce(RentBenchmark.property_type, literal_column("''")),
+)
+Index("uq_rent_benchmarks_bucket", *RENT_BENCHMARK_BUCKET, unique=True)
@@ -78,20 +78,53 @@ CREATE TABLE IF NOT EXISTS listings (
     bedrooms        INTEGER,
     bathrooms       INTEGER,
     property_type   TEXT,
+    city            TEXT,
+    submarket_id    INTEGER,
+    floor_area_sqm  REAL,
     scraped_at      DATETIME DEFAULT CURRENT_TIMESTAMP,
     first_seen_at   DATETIME DEFAULT CURRENT_TIMESTAMP,
     last_seen_at    DATETIME DEFAULT CURRENT_TIMESTAMP,
     description     TEXT,
     FOREIGN KEY (property_id) REFERENCES properties (id),
-    FOREIGN KEY (scrape_run_id) REFERENCES scrape_runs (id)
+    FOREIGN KEY (scrape_run_id) REFERENCES scrape_runs (id),
+    FOREIGN KEY (submarket_id) REFERENCES submarkets (id)
 );
 
+CREATE UNIQUE INDEX IF NOT EXISTS uq_listings_url_portal_property
+    ON listings (url, portal, property_id);
+
+CREATE INDEX IF NOT EXISTS ix_listings_rent_bucket
+    ON listings (listing_type, city, submarket_id, bedrooms, property_type, price, floor_area_sqm);
+
+CREATE INDEX IF NOT EXISTS ix_listings_property_id
+    ON listings (property_id);
+
+-- city / submarket_id / floor_area_sqm sind aus properties gespiegelt
+CREATE TRIGGER IF NOT EXISTS trg_properties_sync_listings
+AFTER UPDATE OF city, submarket_id, floor_area_sqm ON properties
+BEGIN
+    UPDATE listings SET
+        city = (SELECT city FROM properties WHERE properties.id = listings.property_id),
+        submarket_id = (SELECT submarket_id FROM properties WHERE properties.id = listings.property_id),
+        floor_area_sqm = (SELECT floor_area_sqm FROM properties WHERE properties.id = listings.property_id)
+    WHERE property_id = NEW.id;
+END;
+
+CREATE INDEX IF NOT EXISTS ix_properties_city_submarket
+    ON properties (city, submarket_id);
+
 CREATE TABLE IF NOT EXISTS raw_scrapes (
     id          INTEGER PRIMARY KEY,
     listing_id  INTEGER NOT NULL,
     scraped_at  DATETIME DEFAULT CURRENT_TIMESTAMP,
+    raw_text_path   TEXT,
+    raw_html_path   TEXT,
+    content_sha256  TEXT,
     raw_text    TEXT,
     raw_html    TEXT,
     raw_meta    TEXT,
     FOREIGN KEY (listing_id) REFERENCES listings (id)
 );
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_raw_scrapes_listing_sha256
+    ON raw_scrapes (listing_id, content_sha256);
@@ -1,7 +1,7 @@
 # database/seed_benchmarks.py
 
 from datetime import datetime
-from sqlalchemy import select
+from sqlalchemy import insert, select, text
 
 from database.models import (
     ConstructionCostBenchmark,
@@ -17,133 +17,167 @@ def seed_construction_costs(session):
     )
     if existing:
         return
+    _insert_construction_costs(session)
+    session.commit()
+
 
+def _insert_construction_costs(session):
     rows = [
-        ConstructionCostBenchmark(
-            country="UK",
-            region="London",
-            building_type="residential",
-            spec_level="basic",
-            cost_per_sqm_min=1200,
-            cost_per_sqm_max=1600,
-            currency="GBP",
-            source="Internal estimate",
-            as_of_date=datetime(2024, 1, 1),
-        ),
-        ConstructionCostBenchmark(
-            country="UK",
-            region="London",
-            building_type="residential",
-            spec_level="standard",
-            cost_per_sqm_min=1700,
-            cost_per_sqm_max=2300,
-            currency="GBP",
-            source="Internal estimate",
-            as_of_date=datetime(2024, 1, 1),
-        ),
-        ConstructionCostBenchmark(
-            country="UK",
-            region="London",
-            building_type="residential",
-            spec_level="premium",
-            cost_per_sqm_min=2400,
-            cost_per_sqm_max=3200,
-            currency="GBP",
-            source="Internal estimate",
-            as_of_date=datetime(2024, 1, 1),
-        ),
+        {
+            "country": "UK",
+            "region": "London",
+            "building_type": "residential",
+            "spec_level": "basic",
+            "cost_per_sqm_min": 1200,
+            "cost_per_sqm_max": 1600,
+            "currency": "GBP",
+            "source": "Internal estimate",
+            "as_of_date": datetime(2024, 1, 1),
+        },
+        {
+            "country": "UK",
+            "region": "London",
+            "building_type": "residential",
+            "spec_level": "standard",
+            "cost_per_sqm_min": 1700,
+            "cost_per_sqm_max": 2300,
+            "currency": "GBP",
+            "source": "Internal estimate",
+            "as_of_date": datetime(2024, 1, 1),
+        },
+        {
+            "country": "UK",
+            "region": "London",
+            "building_type": "residential",
+            "spec_level": "premium",
+            "cost_per_sqm_min": 2400,
+            "cost_per_sqm_max": 3200,
+            "currency": "GBP",
+            "source": "Internal estimate",
+            "as_of_date": datetime(2024, 1, 1),
+        },
     ]
-    session.add_all(rows)
-    session.commit()
+    session.execute(insert(ConstructionCostBenchmark), rows)
 
 
 def seed_renovation_modules(session):
     existing = session.scalar(select(RenovationModule.id).limit(1))
     if existing:
         return
+    _insert_renovation_modules(session)
+    session.commit()
 
+
+def _insert_renovation_modules(session):
     rows = [
-        RenovationModule(
-            name="Küche komplett",
-            description="Full kitchen refurbishment incl. cabinets, appliances, plumbing, electrics.",
-            typical_cost_min=8000,
-            typical_cost_max=15000,
-            impact_on_rent_pct=5.0,
-            lifetime_years=15,
-        ),
-        RenovationModule(
-            name="Bad Kernsanierung",
-            description="Full bathroom refurbishment incl. tiling, sanitary, plumbing.",
-            typical_cost_min=6000,
-            typical_cost_max=12000,
-            impact_on_rent_pct=4.0,
-            lifetime_years=15,
-        ),
-        RenovationModule(
-            name="Fenster & Dämmung",
-            description="New windows and basic external insulation.",
-            typical_cost_min=10000,
-            typical_cost_max=25000,
-            impact_on_rent_pct=3.0,
-            impact_on_energy_rating_classes=1.0,
-            lifetime_years=25,
-        ),
+        {
+            "name": "Küche komplett",
+            "description": "Full kitchen refurbishment incl. cabinets, appliances, plumbing, electrics.",
+            "typical_cost_min": 8000,
+            "typical_cost_max": 15000,
+            "impact_on_rent_pct": 5.0,
+            "impact_on_energy_rating_classes": None,  # executemany: gleiche Keys pro Zeile
+            "lifetime_years": 15,
+        },
+        {
+            "name": "Bad Kernsanierung",
+            "description": "Full bathroom refurbishment incl. tiling, sanitary, plumbing.",
+            "typical_cost_min": 6000,
+            "typical_cost_max": 12000,
+            "impact_on_rent_pct": 4.0,
+            "impact_on_energy_rating_classes": None,
+            "lifetime_years": 15,
+        },
+        {
+            "name": "Fenster & Dämmung",
+            "description": "New windows and basic external insulation.",
+            "typical_cost_min": 10000,
+            "typical_cost_max": 25000,
+            "impact_on_rent_pct": 3.0,
+            "impact_on_energy_rating_classes": 1.0,
+            "lifetime_years": 25,
+        },
     ]
-    session.add_all(rows)
-    session.commit()
+    session.execute(insert(RenovationModule), rows)
 
 
 def seed_rent_benchmarks(session):
     existing = session.scalar(select(RentBenchmark.id).limit(1))
     if existing:
         return
+    _insert_rent_benchmarks(session)
+    session.commit()
+
 
+def _insert_rent_benchmarks(session):
     rows = [
-        RentBenchmark(
-            country="UK",
-            city="London",
-            submarket_id=None,        # kannst du später auf echte Submarket-IDs mappen
-            bedrooms=1,
-            property_type="Flat",
-            rent_psqm_min=30,
-            rent_psqm_max=45,
-            currency="GBP",
-            source="Internal rent benchmark",
-            as_of_date=datetime(2024, 1, 1),
-        ),
-        RentBenchmark(
-            country="UK",
-            city="London",
-            submarket_id=None,
-            bedrooms=2,
-            property_type="Flat",
-            rent_psqm_min=28,
-            rent_psqm_max=40,
-            currency="GBP",
-            source="Internal rent benchmark",
-            as_of_date=datetime(2024, 1, 1),
-        ),
-        RentBenchmark(
-            country="UK",
-            city="London",
-            submarket_id=None,
-            bedrooms=3,
-            property_type="House",
-            rent_psqm_min=25,
-            rent_psqm_max=38,
-            currency="GBP",
-            source="Internal rent benchmark",
-            as_of_date=datetime(2024, 1, 1),
-        ),
+        {
+            "country": "UK",
+            "city": "London",
+            "submarket_id": None,        # kannst du später auf echte Submarket-IDs mappen
+            "bedrooms": 1,
+            "property_type": "Flat",
+            "rent_psqm_min": 30,
+            "rent_psqm_max": 45,
+            "currency": "GBP",
+            "source": "Internal rent benchmark",
+            "as_of_date": datetime(2024, 1, 1),
+        },
+        {
+            "country": "UK",
+            "city": "London",
+            "submarket_id": None,
+            "bedrooms": 2,
+            "property_type": "Flat",
+            "rent_psqm_min": 28,
+            "rent_psqm_max": 40,
+            "currency": "GBP",
+            "source": "Internal rent benchmark",
+            "as_of_date": datetime(2024, 1, 1),
+        },
+        {
+            "country": "UK",
+            "city": "London",
+            "submarket_id": None,
+            "bedrooms": 3,
+            "property_type": "House",
+            "rent_psqm_min": 25,
+            "rent_psqm_max": 38,
+            "currency": "GBP",
+            "source": "Internal rent benchmark",
+            "as_of_date": datetime(2024, 1, 1),
+        },
     ]
-    session.add_all(rows)
-    session.commit()
+    session.execute(insert(RentBenchmark), rows)
+
+
+def _existence_flags(session):
+    """
+    Ein Roundtrip statt drei: (construction_costs, renovation_modules,
+    rent_benchmarks) -> jeweils True, wenn die Tabelle schon Zeilen hat.
+    """
+    return session.execute(
+        text(
+            "SELECT EXISTS(SELECT 1 FROM construction_cost_benchmarks), "
+            "EXISTS(SELECT 1 FROM renovation_modules), "
+            "EXISTS(SELECT 1 FROM rent_benchmarks)"
+        )
+    ).one()
 
 
 def seed_all_benchmarks(session):
     """
     Wird beim App-Start aufgerufen, fügt Daten nur ein, wenn Tabellen leer sind.
     """
-    seed_construction_costs(session)
-    seed_renovation_modules(session)
-    seed_rent_benchmarks(session)
+    has_costs, has_modules, has_rents = _existence_flags(session)
+
+    if not has_costs:
+        _insert_construction_costs(session)
+    if not has_modules:
+        _insert_renovation_modules(session)
+    if not has_rents:
+        _insert_rent_benchmarks(session)
+
+    # ein Commit für alle Seeds
+    if not (has_costs and has_modules and has_rents):
+        session.commit()
@@ -1,34 +1,25 @@
 """
 Nightly scraper for EstateAI.
 
-- Scrapes SALE & RENT listings from Rightmove
+- Scrapes SALE and/or RENT listings from Rightmove (concurrently)
 - Writes everything into estateai.db via ingest_bulk_results
 - Designed to be run from GitHub Actions as well as locally.
+
+Einziger Einstiegspunkt für Scrape + Ingest; der Modus kommt aus
+ESTATEAI_MODE (sale / rent / both / benchmarks).
 """
 
+import asyncio
 import os
+from datetime import date
+from pathlib import Path
 
+from database.bootstrap import ensure_db_initialized
 from database.connection import get_session
-from database.models import Base
-from database.seed_benchmarks import seed_all_benchmarks
-from database.ingest import ingest_bulk_results
-
-# SALE: Haupt-Scraper
-from scraper.sources.rightmove_scraper import scrape_all_sync
-# RENT: eigener Rent-Scraper
-from scraper.sources.rightmove_rent_scraper import scrape_all_rentals_sync
-
+from database.ingest import finish_scrape_run, ingest_bulk_results, start_scrape_run
+from pipelines.build_rent_benchmarks import build_rent_benchmarks
 
-def ensure_db_initialized() -> None:
-    """
-    Create tables if they don't exist and seed benchmarks.
-    """
-    with get_session() as session:
-        bind = session.get_bind()
-        print(f"[DB] Using database URL: {bind.url}")
-        Base.metadata.create_all(bind=bind)
-        # idempotent: seed nur, wenn Tabellen leer sind
-        seed_all_benchmarks(session)
+MODES = ("sale", "rent", "both", "benchmarks")
 
 
 def run_nightly_scrape() -> None:
@@ -37,11 +28,18 @@ def run_nightly_scrape() -> None:
 
     Steuerbar über Env-Variablen (praktisch für GitHub Actions):
 
+    - ESTATEAI_MODE            (default: "both")
     - ESTATEAI_SCRAPE_LOCATION (default: "London")
     - ESTATEAI_SALE_PAGES     (default: "20")
     - ESTATEAI_RENT_PAGES     (default: "20")
+    - ESTATEAI_CHECKPOINT_DIR  (optional: .jsonl-Checkpoints für Resume)
+    - ESTATEAI_MAX_CONCURRENCY (optional: parallele Detailseiten pro Lauf)
     """
 
+    mode = os.getenv("ESTATEAI_MODE", "both").lower()
+    if mode not in MODES:
+        raise ValueError(f"ESTATEAI_MODE must be one of {MODES}, got {mode!r}")
+
     location = os.getenv("ESTATEAI_SCRAPE_LOCATION", "London")
     sale_pages = int(os.getenv("ESTATEAI_SALE_PAGES", "20"))
     rent_pages = int(os.getenv("ESTATEAI_RENT_PAGES", "20"))
@@ -49,41 +47,210 @@ def run_nightly_scrape() -> None:
     print("========================================")
     print(" EstateAI Nightly Rightmove Scrape")
     print("========================================")
+    print(f"Mode:         {mode}")
     print(f"Location:     {location}")
-    print(f"SALE pages:   {sale_pages}")
-    print(f"RENT pages:   {rent_pages}")
+    if mode in ("sale", "both"):
+        print(f"SALE pages:   {sale_pages}")
+    if mode in ("rent", "both"):
+        print(f"RENT pages:   {rent_pages}")
     print("========================================")
 
     ensure_db_initialized()
 
-    # -------- SALE --------
-    print(f"▶ Scraping SALE listings for {location}, pages={sale_pages}")
-    sale_results = scrape_all_sync(location=location, pages=sale_pages)
-    print(f"SALE scraped: {len(sale_results)} rows")
+    if mode == "benchmarks":
+        created = build_rent_benchmarks()
+        print(f"Built {created} rent benchmark buckets.")
+        return
 
-    total_s, success_s, error_s = ingest_bulk_results(
-        sale_results,
-        portal="rightmove",
-        location_query=f"{location}, pages={sale_pages}",
-        listing_type="sale",
-    )
-    print(f"SALE ingest result: total={total_s}, success={success_s}, error={error_s}")
-
-    # -------- RENT --------
-    print(f"▶ Scraping RENT listings for {location}, pages={rent_pages}")
-    rent_results = scrape_all_rentals_sync(location=location, pages=rent_pages)
-    print(f"RENT scraped: {len(rent_results)} rows")
-
-    total_r, success_r, error_r = ingest_bulk_results(
-        rent_results,
-        portal="rightmove",
-        location_query=f"{location}, pages={rent_pages}",
-        listing_type="rent",
-    )
-    print(f"RENT ingest result: total={total_r}, success={success_r}, error={error_r}")
+    # Eine Session/Transaktion für den ganzen Lauf: alle Ingest-Batches und
+    # der Benchmark-Rebuild landen in genau einem Commit (ein fsync statt
+    # einem pro Batch). Bricht der Lauf ab, bleibt die DB unverändert.
+    with get_session() as session:
+        asyncio.run(
+            _scrape_and_ingest_all(
+                location,
+                sale_pages if mode in ("sale", "both") else 0,
+                rent_pages if mode in ("rent", "both") else 0,
+                session,
+            )
+        )
+
+        if mode in ("rent", "both"):
+            created = build_rent_benchmarks(session=session)
+            print(f"Built {created} rent benchmark buckets.")
 
     print("✅ Nightly scrape finished.")
 
 
+# Zeilen pro Ingest-Batch, während der Scraper weiterläuft
+INGEST_QUEUE_BATCH = int(os.getenv("ESTATEAI_INGEST_BATCH", "100"))
+
+
+def _max_concurrency_kwargs():
+    """
+    Parallele Detailseiten pro SALE/RENT-Lauf (Semaphore im Scraper).
+    Ohne Env gilt DEFAULT_MAX_CONCURRENCY des Scrapers.
+    """
+    value = os.getenv("ESTATEAI_MAX_CONCURRENCY")
+    if not value:
+        return {}
+    max_concurrency = int(value)
+    if max_concurrency < 1:
+        raise ValueError(f"ESTATEAI_MAX_CONCURRENCY must be >= 1, got {value!r}")
+    return {"max_concurrency": max_concurrency}
+
+
+def _checkpoint_path(listing_type: str, location: str):
+    """
+    Ein Checkpoint pro Typ/Ort/Tag: stirbt der Lauf, scrapt ein Neustart am
+    selben Tag nur die fehlenden URLs und ingestet die schon gescrapten neu.
+    """
+    checkpoint_dir = os.getenv("ESTATEAI_CHECKPOINT_DIR")
+    if not checkpoint_dir:
+        return None
+    return Path(checkpoint_dir) / f"{listing_type}_{location}_{date.today().isoformat()}.jsonl"
+
+
+async def _ingest_batch(
+    label: str,
+    batch,
+    listing_type: str,
+    ingest_lock: asyncio.Lock,
+    session,
+    scrape_run,
+) -> None:
+    # SQLite kennt nur einen Writer (und die Session ist nicht thread-safe)
+    # -> Ingests nacheinander, im Thread, damit der Event-Loop weiterläuft
+    async with ingest_lock:
+        total, success, error = await asyncio.to_thread(
+            ingest_bulk_results,
+            batch,
+            portal=scrape_run.portal,
+            location_query=scrape_run.location_query,
+            listing_type=listing_type,
+            session=session,
+            scrape_run=scrape_run,
+        )
+    print(f"{label} ingest result: total={total}, success={success}, error={error}")
+
+
+async def _scrape_and_ingest(
+    label: str,
+    scrape_fn,
+    location: str,
+    pages: int,
+    listing_type: str,
+    ingest_lock: asyncio.Lock,
+    session,
+) -> None:
+    """
+    Scraper und Ingest laufen als Pipeline: der Scraper legt jede fertige
+    Zeile in eine asyncio.Queue, der Consumer schreibt sie in Batches von
+    INGEST_QUEUE_BATCH weg, während schon die nächsten Seiten geladen werden.
+    Alle Batches zählen auf einen gemeinsamen ScrapeRun, der erst nach dem
+    letzten Batch abgeschlossen wird.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async with ingest_lock:
+        scrape_run = await asyncio.to_thread(
+            start_scrape_run, session, "rightmove", f"{location}, pages={pages}"
+        )
+
+    async def produce() -> None:
+        try:
+            results = await scrape_fn(
+                location=location,
+                pages=pages,
+                queue=queue,
+                checkpoint_path=_checkpoint_path(listing_type, location),
+                **_max_concurrency_kwargs(),
+            )
+            print(f"{label} scraped: {len(results)} rows")
+        finally:
+            await queue.put(None)  # Ende-Signal, auch wenn der Scraper abbricht
+
+    async def consume() -> None:
+        batch = []
+        while True:
+            row = await queue.get()
+            if row is None:
+                break
+            batch.append(row)
+            if len(batch) >= INGEST_QUEUE_BATCH:
+                await _ingest_batch(label, batch, listing_type, ingest_lock, session, scrape_run)
+                batch = []
+        if batch:
+            await _ingest_batch(label, batch, listing_type, ingest_lock, session, scrape_run)
+
+    print(f"▶ Scraping {label} listings for {location}, pages={pages}")
+    await asyncio.gather(produce(), consume())
+
+    async with ingest_lock:
+        await asyncio.to_thread(finish_scrape_run, session, scrape_run)
+    print(
+        f"{label} scrape run #{scrape_run.id}: total={scrape_run.total_listings}, "
+        f"success={scrape_run.success_count}, error={scrape_run.error_count}"
+    )
+
+
+async def _scrape_and_ingest_all(
+    location: str,
+    sale_pages: int,
+    rent_pages: int,
+    session,
+) -> None:
+    """
+    pages == 0 -> Lauf überspringen. Scraper (ziehen Playwright nach) werden
+    erst importiert, wenn sie im gewählten Modus wirklich gebraucht werden.
+    """
+    # SALE und RENT sind unabhängig und netzwerkgebunden -> parallel
+    ingest_lock = asyncio.Lock()
+    jobs = []
+
+    if sale_pages:
+        # SALE: Haupt-Scraper
+        from scraper.sources.rightmove_scraper import scrape_all
+
+        jobs.append(
+            _scrape_and_ingest(
+                "SALE",
+                scrape_all,
+                location,
+                sale_pages,
+                "sale",
+                ingest_lock,
+                session,
+            )
+        )
+
+    if rent_pages:
+        # RENT: eigener Rent-Scraper
+        from scraper.sources.rightmove_rent_scraper import scrape_all_rentals
+
+        jobs.append(
+            _scrape_and_ingest(
+                "RENT",
+                scrape_all_rentals,
+                location,
+                rent_pages,
+                "rent",
+                ingest_lock,
+                session,
+            )
+        )
+
+    if not jobs:
+        return
+
+    from scraper.sources.rightmove_scraper import POOL
+
+    try:
+        await asyncio.gather(*jobs)
+    finally:
+        # ein gemeinsamer Browser für SALE + RENT, erst ganz am Ende schließen
+        await POOL.shutdown()
+
+
 if __name__ == "__main__":
     run_nightly_scrape()
@@ -2,13 +2,96 @@
 
 from datetime import datetime
 
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, case, delete, select, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
-from database.connection import get_session
+from database.connection import session_scope
 from database import models
 
-
-def build_rent_benchmarks(min_listings_per_bucket: int = 5) -> int:
+SOURCE = "rightmove_rent_scraper_v1"
+
+# Getrimmtes Band pro Bucket
+LOWER_QUANTILE = 0.1
+UPPER_QUANTILE = 0.9
+
+# Buckets pro gestreamter Partition (= pro executemany-Upsert)
+AGG_PARTITION_SIZE = 1000
+
+
+# ----------------------------------------------------------
+# Statements einmal pro Prozess bauen; SQLAlchemy cached das kompilierte
+# SQL am Statement-Objekt, jeder Aufruf spart sich so die Core-Kompilierung.
+# ----------------------------------------------------------
+
+# city/submarket_id/m² sind auf listings gespiegelt -> kein JOIN,
+# pro Bucket nach rent_psqm durchnummeriert (Window-Funktionen)
+_bucket = (
+    models.Listing.city,
+    models.Listing.submarket_id,
+    models.Listing.bedrooms,
+    models.Listing.property_type,
+)
+_rent_psqm = models.Listing.price / models.Listing.floor_area_sqm
+
+_ranked = (
+    select(
+        models.Listing.city.label("city"),
+        models.Listing.submarket_id.label("submarket_id"),
+        models.Listing.bedrooms.label("bedrooms"),
+        models.Listing.property_type.label("property_type"),
+        _rent_psqm.label("rent_psqm"),
+        func.row_number().over(partition_by=_bucket, order_by=_rent_psqm).label("rn"),
+        func.count().over(partition_by=_bucket).label("cnt"),
+    )
+    .where(
+        models.Listing.listing_type == "rent",
+        models.Listing.price.isnot(None),
+        models.Listing.floor_area_sqm.isnot(None),
+        models.Listing.floor_area_sqm > 0,
+    )
+    .subquery("ranked")
+)
+
+# Band = getrimmte Quantile statt MIN/MAX, damit einzelne Ausreißer
+# (kaputte Flächenangaben etc.) den Bucket nicht dominieren
+_RENT_AGG_STMT = (
+    select(
+        _ranked.c.city,
+        _ranked.c.submarket_id,
+        _ranked.c.bedrooms,
+        _ranked.c.property_type,
+        func.min(
+            case((_ranked.c.rn >= LOWER_QUANTILE * _ranked.c.cnt, _ranked.c.rent_psqm))
+        ).label("rent_psqm_min"),
+        func.max(
+            case((_ranked.c.rn <= UPPER_QUANTILE * _ranked.c.cnt, _ranked.c.rent_psqm))
+        ).label("rent_psqm_max"),
+    )
+    .group_by(
+        _ranked.c.city,
+        _ranked.c.submarket_id,
+        _ranked.c.bedrooms,
+        _ranked.c.property_type,
+    )
+    # zu wenig Daten → Bucket schon in SQL verwerfen
+    .having(func.count() >= bindparam("min_n"))
+)
+
+# Upsert über die Bucket-Identität (siehe models.RENT_BENCHMARK_BUCKET)
+_RENT_UPSERT = sqlite_insert(models.RentBenchmark)
+_RENT_UPSERT = _RENT_UPSERT.on_conflict_do_update(
+    index_elements=list(models.RENT_BENCHMARK_BUCKET),
+    set_={
+        "rent_psqm_min": _RENT_UPSERT.excluded.rent_psqm_min,
+        "rent_psqm_max": _RENT_UPSERT.excluded.rent_psqm_max,
+        "currency": _RENT_UPSERT.excluded.currency,
+        "source": _RENT_UPSERT.excluded.source,
+        "as_of_date": _RENT_UPSERT.excluded.as_of_date,
+    },
+)
+
+
+def build_rent_benchmarks(min_listings_per_bucket: int = 5, session=None) -> int:
     """
     Aggregiert Mietdaten aus listings (listing_type='rent') in die Tabelle rent_benchmarks.
 
@@ -19,74 +102,54 @@ def build_rent_benchmarks(min_listings_per_bucket: int = 5) -> int:
     - property_type
 
     rent_psqm = Miete_pcm / floor_area_sqm
+    rent_psqm_min / rent_psqm_max = 10%- / 90%-Quantil im Bucket
 
     min_listings_per_bucket:
         nur Buckets mit genügend Datenpunkten werden gespeichert.
-    """
-    with get_session() as session:
-        # Alte Benchmarks erstmal löschen (voller Rebuild)
-        session.query(models.RentBenchmark).delete()
-
-        # JOIN: Listing (rent) + Property (für m², city, submarket_id)
-        stmt = (
-            select(
-                models.Property.city.label("city"),
-                models.Property.submarket_id.label("submarket_id"),
-                models.Listing.bedrooms.label("bedrooms"),
-                models.Listing.property_type.label("property_type"),
-                func.min(models.Listing.price / models.Property.floor_area_sqm).label("rent_psqm_min"),
-                func.max(models.Listing.price / models.Property.floor_area_sqm).label("rent_psqm_max"),
-                func.count(models.Listing.id).label("n"),
-            )
-            .join(models.Property, models.Listing.property_id == models.Property.id)
-            .where(
-                models.Listing.listing_type == "rent",
-                models.Listing.price.isnot(None),
-                models.Property.floor_area_sqm.isnot(None),
-                models.Property.floor_area_sqm > 0,
-            )
-            .group_by(
-                models.Property.city,
-                models.Property.submarket_id,
-                models.Listing.bedrooms,
-                models.Listing.property_type,
-            )
-        )
 
-        rows = session.execute(stmt).all()
+    Buckets werden per INSERT ... ON CONFLICT DO UPDATE aktualisiert, IDs
+    bleiben also stabil. Buckets dieser Quelle, die im aktuellen Lauf nicht
+    mehr vorkommen, werden danach entfernt.
 
-        created = 0
+    session: optional von außen (dann committet der Aufrufer).
+    """
+    with session_scope(session) as session:
         now = datetime.utcnow()
 
-        for row in rows:
-            city = row.city or "Unknown"
-            submarket_id = row.submarket_id
-            bedrooms = row.bedrooms
-            property_type = row.property_type
-            rent_psqm_min = float(row.rent_psqm_min) if row.rent_psqm_min is not None else None
-            rent_psqm_max = float(row.rent_psqm_max) if row.rent_psqm_max is not None else None
-            n = row.n or 0
-
-            if n < min_listings_per_bucket:
-                # zu wenig Daten → Bucket überspringen
-                continue
-
-            rb = models.RentBenchmark(
-                country="UK",
-                city=city,
-                submarket_id=submarket_id,
-                bedrooms=bedrooms,
-                property_type=property_type,
-                rent_psqm_min=rent_psqm_min,
-                rent_psqm_max=rent_psqm_max,
-                currency="GBP",
-                source="rightmove_rent_scraper_v1",
-                as_of_date=now,
-            )
-            session.add(rb)
-            created += 1
+        # Ergebnis streamen statt .all(): pro Partition ein executemany-Upsert,
+        # Speicherbedarf bleibt konstant, egal wie viele Buckets es gibt
+        result = session.execute(
+            _RENT_AGG_STMT.execution_options(yield_per=AGG_PARTITION_SIZE),
+            {"min_n": min_listings_per_bucket},
+        )
 
-        session.commit()
+        created = 0
+        for partition in result.partitions():
+            payload = [
+                dict(
+                    country="UK",
+                    city=row.city or "Unknown",
+                    submarket_id=row.submarket_id,
+                    bedrooms=row.bedrooms,
+                    property_type=row.property_type,
+                    rent_psqm_min=float(row.rent_psqm_min) if row.rent_psqm_min is not None else None,
+                    rent_psqm_max=float(row.rent_psqm_max) if row.rent_psqm_max is not None else None,
+                    currency="GBP",
+                    source=SOURCE,
+                    as_of_date=now,
+                )
+                for row in partition
+            ]
+            session.execute(_RENT_UPSERT, payload)
+            created += len(payload)
+
+        # Buckets, die diesmal nicht mehr genug Daten hatten, aufräumen
+        session.execute(
+            delete(models.RentBenchmark).where(
+                models.RentBenchmark.source == SOURCE,
+                models.RentBenchmark.as_of_date < now,
+            )
+        )
 
         return created
 
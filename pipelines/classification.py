@@ -8,8 +8,6 @@ def classify_price_segment(price_numeric: int):
     return "high"
 
 def classify_listing(data: dict) -> dict:
-    price_segment = classify_price_segment(data.get("price_numeric"))
-    return {
-        **data,
-        "price_segment": price_segment,
-    }
+    # in-place, wie add_features / clean_listing
+    data["price_segment"] = classify_price_segment(data.get("price_numeric"))
+    return data
@@ -1,16 +1,24 @@
 import re
 
+# Löschtabelle: alle Latin-1-Zeichen außer Ziffern fliegen raus (ein C-Durchlauf)
+_DROP_NON_DIGITS = str.maketrans(
+    "", "", "".join(chr(c) for c in range(256) if not chr(c).isdecimal())
+)
+_NON_DIGIT_RE = re.compile(r"\D")
+
 def extract_price_number(price_str: str):
     if not price_str:
         return None
-    digits = re.sub(r"[^\d]", "", price_str)
+    digits = price_str.translate(_DROP_NON_DIGITS)
+    if digits and not digits.isdecimal():
+        # Zeichen außerhalb von Latin-1 übrig -> Regex-Fallback
+        digits = _NON_DIGIT_RE.sub("", price_str)
     return int(digits) if digits else None
 
 def add_features(data: dict) -> dict:
+    # in-place: keine Dict-Kopie pro Listing und Pipeline-Stufe
     numeric_price = extract_price_number(data.get("price"))
 
-    return {
-        **data,
-        "price_numeric": numeric_price,
-        "is_luxury": numeric_price and numeric_price > 5_000_000,
-    }
+    data["price_numeric"] = numeric_price
+    data["is_luxury"] = numeric_price and numeric_price > 5_000_000
+    return data
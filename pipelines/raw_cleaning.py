@@ -1,18 +1,13 @@
+# \n/\t -> Leerzeichen, \r raus – alles in einem translate-Durchlauf
+_WS_TABLE = str.maketrans({"\n": " ", "\t": " ", "\r": None})
+
 def clean_text(value: str) -> str:
     if not value:
         return None
-    return (
-        value.replace("\n", " ")
-        .replace("\t", " ")
-        .replace("\r", "")
-        .strip()
-    )
+    return value.translate(_WS_TABLE).strip()
 
 def clean_listing(data: dict) -> dict:
-    return {
-        **data,
-        "title": clean_text(data.get("title")),
-        "price": clean_text(data.get("price")),
-        "address": clean_text(data.get("address")),
-        "description": clean_text(data.get("description")),
-    }
+    # in-place: das Scraper-Dict wird direkt bereinigt statt kopiert
+    for key in ("title", "price", "address", "description"):
+        data[key] = clean_text(data.get(key))
+    return data
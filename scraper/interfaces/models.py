@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ScraperResult:
     url: str
     title: Optional[str]
@@ -1,123 +1,83 @@
-import asyncio
 import re
-from playwright.async_api import async_playwright
 
-BASE = "https://www.rightmove.co.uk"
-
-
-# ----------------------------------------------------------
-# Browser Setup
-# ----------------------------------------------------------
-async def launch_browser():
-    pw = await async_playwright().start()
-
-    browser = await pw.chromium.launch(
-        headless=True,
-        args=[
-            "--disable-blink-features=AutomationControlled",
-            "--disable-web-security",
-            "--disable-dev-shm-usage",
-        ],
-    )
-
-    context = await browser.new_context(
-        viewport={"width": 1600, "height": 1200},
-        locale="en-GB",
-        java_script_enabled=True,
-        bypass_csp=True,
-        user_agent=(
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/123.0.0.0 Safari/537.36"
-        ),
-    )
-
-    # Basic anti-bot hardening
-    await context.add_init_script(
-        """
-        Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-
-        Object.defineProperty(navigator, 'platform', { get: () => 'Win32' });
-        Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
-        Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
-
-        const originalQuery = window.navigator.permissions.query;
-        window.navigator.permissions.query = (parameters) => (
-            parameters.name === 'notifications'
-                ? Promise.resolve({ state: Notification.permission })
-                : originalQuery(parameters)
-        );
-        """
-    )
-
-    page = await context.new_page()
-    return pw, browser, page
+# Browser kommt aus dem warmen Pool, die Sync-Wrapper laufen auf dessen Loop
+from .rightmove_scraper import (
+    DEFAULT_MAX_CONCURRENCY,
+    DETAIL_FIELDS_JS,
+    EMPTY_DETAIL_FIELDS,
+    POOL,
+    _first_number,
+    extract_detail_text,
+    extract_listing_links,
+    run_sync,
+    scrape_urls,
+    scroll_and_settle,
+    wait_for_listing_cards,
+)
 
+BASE = "https://www.rightmove.co.uk"
 
-# ----------------------------------------------------------
-# Accept Cookies
-# ----------------------------------------------------------
-async def accept_cookies(page):
-    try:
-        await page.locator("#onetrust-accept-btn-handler").click(timeout=3000)
-    except Exception:
-        pass
+# Regexe für parse_from_body_text, einmal beim Import kompiliert
+PRICE_RE = re.compile(r"£\s*[\d,]+")
+# "4 bedrooms" / "2 bathrooms" in einem Scan; kein Zeilenumbruch zwischen Zahl und Wort
+ROOMS_RE = re.compile(r"(\d+)[^\S\r\n]*(bed|bath)rooms?", re.I)
 
-    try:
-        await page.locator("button[aria-label='Accept all']").click(timeout=3000)
-    except Exception:
-        pass
+# Ende des Description-Blocks: exakte Header per Set-Lookup, Teilstrings
+# per einer Alternation ("HOLLAND PARK GATE DEVELOPMENT" enthält DEVELOPMENT)
+DESC_STOP_EXACT = frozenset({"-"})
+DESC_STOP_SUB = re.compile(r"DEVELOPMENT")
 
 
 # ----------------------------------------------------------
-# Safe innerText evaluator
+# Titel/Adresse/Description in einem CDP-Call
 # ----------------------------------------------------------
-async def safe_eval(page, selector):
+async def fetch_detail_fields(page):
+    """
+    Ein evaluate() statt bis zu fünf query_selector + inner_text-Paaren
+    (h1, zwei Address- und zwei Description-Selektoren).
+    """
     try:
-        el = await page.query_selector(selector)
-        if el:
-            txt = await el.inner_text()
-            if txt:
-                return txt.strip()
+        fields = await page.evaluate(DETAIL_FIELDS_JS)
     except Exception:
-        return None
-    return None
+        fields = None
+    if not isinstance(fields, dict):
+        return dict(EMPTY_DETAIL_FIELDS)
+    return fields
 
 
 # ----------------------------------------------------------
 # FETCH LISTINGS
 # ----------------------------------------------------------
 async def fetch_links(location="London", max_pages=1):
-    pw, browser, page = await launch_browser()
+    context, page = await POOL.acquire()
+    try:
+        return await _fetch_links_on_page(page, location, max_pages)
+    finally:
+        await POOL.release(context)
 
+
+async def _fetch_links_on_page(page, location, max_pages):
     print(f"➡️ Fetching Rightmove listings for: {location}")
 
     # TODO: echte locationIdentifier-Mapping einbauen
     loc_id = "REGION^87490"  # London fallback
 
-    links = []
+    # dict als geordnetes Set: O(1)-Dedup beim Einsammeln
+    links = {}
 
     for p in range(max_pages):
         url = f"{BASE}/property-for-sale/find.html?locationIdentifier={loc_id}&index={p * 24}"
 
         print(f"📄 Loading listing page: {url}")
-        await page.goto(url, timeout=70000)
-        await accept_cookies(page)
-        await page.wait_for_timeout(2000)
-
-        cards = await page.query_selector_all("a.propertyCard-link")
-
-        for c in cards:
-            href = await c.get_attribute("href")
-            if href and "/properties/" in href:
-                clean = BASE + href.split("?")[0]
-                links.append(clean)
+        # nicht auf "load" (alle Bilder/Skripte) warten, die Karten-Waits reichen
+        await page.goto(url, timeout=70000, wait_until="domcontentloaded")
+        if not await wait_for_listing_cards(page):
+            print(f"⚠️ Keine Listing-Karten auf {url}")
+            continue
 
-    await browser.close()
-    await pw.stop()
+        links.update(dict.fromkeys(await extract_listing_links(page)))
 
-    # unique
-    return list(set(links))
+    return list(links)
 
 
 # ----------------------------------------------------------
@@ -128,7 +88,8 @@ def parse_from_body_text(body_text: str):
     Verwendet den reinen Text (ohne DOM-Selektoren),
     um price, property_type, bedrooms, bathrooms, description zu extrahieren.
     """
-    lines = [l.strip() for l in body_text.splitlines() if l.strip()]
+    # strip() nur einmal pro Zeile statt für Filter und Wert getrennt
+    lines = [l for l in map(str.strip, body_text.splitlines()) if l]
 
     price = None
     property_type = None
@@ -136,68 +97,56 @@ def parse_from_body_text(body_text: str):
     bathrooms = None
     description = ""
 
-    # --- PRICE: erste Zeile, die mit £ beginnt ---
-    for l in lines:
-        if l.startswith("£"):
-            m = re.search(r"£\s*[\d,]+", l)
-            if m:
-                price = m.group(0)
-                break
-
-    # --- PROPERTY TYPE: Zeile nach "PROPERTY TYPE" ---
+    # --- Ein Durchlauf über alle Zeilen statt sechs einzelner Scans ---
+    # price:         erste Zeile, die mit £ beginnt
+    # property_type: Zeile nach "PROPERTY TYPE"
+    # bedrooms/-baths: Zahl in der Zeile nach "BEDROOMS"/"BATHROOMS"
+    # description:   alles nach "Description" bis zum nächsten Block
+    n_lines = len(lines)
+    in_desc = False
+    desc_done = False
+    desc_lines = []
     for idx, l in enumerate(lines):
-        if l.upper() == "PROPERTY TYPE" and idx + 1 < len(lines):
-            property_type = lines[idx + 1]
-            break
-
-    # --- BEDROOMS: Zeile nach "BEDROOMS" oder "4 bedrooms" etc. ---
-    if not bedrooms:
-        for idx, l in enumerate(lines):
-            if l.upper() == "BEDROOMS" and idx + 1 < len(lines):
-                m = re.search(r"\d+", lines[idx + 1])
-                if m:
-                    bedrooms = m.group(0)
-                    break
-    if not bedrooms:
-        for l in lines:
-            m = re.search(r"(\d+)\s*bedrooms?", l, re.I)
-            if m:
-                bedrooms = m.group(1)
-                break
+        upper = l.upper()  # einzige Case-Konvertierung pro Zeile
 
-    # --- BATHROOMS: analog ---
-    if not bathrooms:
-        for idx, l in enumerate(lines):
-            if l.upper() == "BATHROOMS" and idx + 1 < len(lines):
-                m = re.search(r"\d+", lines[idx + 1])
-                if m:
-                    bathrooms = m.group(0)
-                    break
-    if not bathrooms:
-        for l in lines:
-            m = re.search(r"(\d+)\s*bathrooms?", l, re.I)
+        if price is None and l[0] == "£":  # Zeilen sind nie leer (Filter oben)
+            m = PRICE_RE.search(l)
             if m:
-                bathrooms = m.group(1)
-                break
-
-    # --- DESCRIPTION: alles nach "Description" bis zum nächsten Block ---
-    in_desc = False
-    desc_lines = []
-    for l in lines:
-        lower = l.lower()
-        upper = l.upper()
+                price = m.group(0)
 
+        if idx + 1 < n_lines:
+            if property_type is None and upper == "PROPERTY TYPE":
+                property_type = lines[idx + 1]
+            elif bedrooms is None and upper == "BEDROOMS":
+                bedrooms = _first_number(lines[idx + 1])
+            elif bathrooms is None and upper == "BATHROOMS":
+                bathrooms = _first_number(lines[idx + 1])
+
+        if desc_done:
+            # alles gefunden -> Rest der Seite (Footer, Nachbar-Listings) überspringen
+            if None not in (price, property_type, bedrooms, bathrooms):
+                break
+            continue
         if not in_desc:
-            if lower.startswith("description"):
+            if upper.startswith("DESCRIPTION"):
                 in_desc = True
             continue
-
         # Stop-Kandidaten: nächster Block-Header in ALL CAPS oder "HOLLAND PARK GATE DEVELOPMENT" etc.
-        if upper == "-" or "DEVELOPMENT" in upper or upper.startswith("HOLLAND PARK GATE DEVELOPMENT"):
-            break
-
+        if upper in DESC_STOP_EXACT or DESC_STOP_SUB.search(upper):
+            desc_done = True
+            continue
         desc_lines.append(l)
 
+    # Fallback "4 bedrooms" etc. nur, wenn es kein Label gab
+    if not (bedrooms and bathrooms):
+        for m in ROOMS_RE.finditer(body_text):
+            if m.group(2).lower() == "bed":
+                bedrooms = bedrooms or m.group(1)
+            else:
+                bathrooms = bathrooms or m.group(1)
+            if bedrooms and bathrooms:
+                break
+
     if desc_lines:
         description = "\n".join(desc_lines).strip()
 
@@ -208,11 +157,16 @@ def parse_from_body_text(body_text: str):
 # SCRAPE ONE PROPERTY (v4.7)
 # ----------------------------------------------------------
 async def scrape_property(url):
-    pw, browser, page = await launch_browser()
+    context, page = await POOL.acquire()
+    try:
+        return await _scrape_property_page(page, url)
+    finally:
+        await POOL.release(context)
+
 
+async def _scrape_property_page(page, url):
     print(f"🏠 Scraping: {url}")
-    await page.goto(url, timeout=70000)
-    await accept_cookies(page)
+    await page.goto(url, timeout=70000, wait_until="domcontentloaded")
 
     # Warten, bis zumindest irgendwas Sinnvolles da ist
     try:
@@ -220,43 +174,33 @@ async def scrape_property(url):
     except Exception:
         pass
 
-    await page.wait_for_timeout(1500)
-
-    # Leicht scrollen, um Lazy Load zu triggern
-    try:
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await page.wait_for_timeout(1500)
-    except Exception:
-        pass
-
     # --------------------- TITLE & ADDRESS -----------------------
-    title = await safe_eval(page, "h1")
-
-    # Manche Properties haben separate Address-Blöcke; best guess:
-    address = await safe_eval(page, "[data-testid='address']") \
-        or await safe_eval(page, "[data-testid='address-display']")
+    fields = await fetch_detail_fields(page)
+    title = fields["title"]
+    address = fields["address"]
 
     # Wenn keine separate Address → nimm Title als Address
     if not address and title:
         address = title
 
+    # Lazy Load nur anstoßen, wenn die Description noch nicht im DOM hängt
+    # (statt fester 2x 1,5 s Sleep pro Property)
+    if not fields["description"]:
+        await scroll_and_settle(page)
+
     # --------------------- BODY-TEXT-PARSING --------------------
-    try:
-        body_text = await page.inner_text("body")
-    except Exception:
-        body_text = ""
+    # nur die Detail-Container (h1 + <main>-Artikel), Body als Fallback
+    body_text = await extract_detail_text(page)
 
     price, property_type, bedrooms, bathrooms, description = parse_from_body_text(body_text)
 
     # Fallback: description direkt aus DOM, falls vorhanden
     if not description:
-        description = await safe_eval(page, "[data-testid='description']") \
-            or await safe_eval(page, "[data-testid='read-full-description']") \
+        # nach dem Scroll kann der Block nachgeladen sein -> einmal neu lesen
+        description = fields["description"] \
+            or (await fetch_detail_fields(page))["description"] \
             or ""
 
-    await browser.close()
-    await pw.stop()
-
     return {
         "url": url,
         "title": title,
@@ -273,33 +217,33 @@ async def scrape_property(url):
 # ----------------------------------------------------------
 # Complete Workflow: Listings → Property Details
 # ----------------------------------------------------------
-async def scrape_all(location="London", pages=1):
+async def scrape_all(location="London", pages=1, max_concurrency=DEFAULT_MAX_CONCURRENCY):
     links = await fetch_links(location, pages)
-    results = []
 
     print(f"📦 {len(links)} listings found.")
 
-    for idx, url in enumerate(links):
-        print(f"➡️ {idx + 1}/{len(links)} → {url}")
-        try:
-            data = await scrape_property(url)
-            results.append(data)
-        except Exception as e:
-            print(f"❌ ERROR scraping {url}: {e}")
+    # Detailseiten parallel (Semaphore-Äquivalent: Pool aus max_concurrency Pages)
+    async def _scrape_page(page, url, logger):
+        return await _scrape_property_page(page, url)
 
-    return results
+    return await scrape_urls(
+        links,
+        _scrape_page,
+        print,
+        max_concurrency=max_concurrency,
+    )
 
 
 # ----------------------------------------------------------
 # Sync wrappers (for FastAPI)
 # ----------------------------------------------------------
 def fetch_links_sync(location="London", pages=1):
-    return asyncio.run(fetch_links(location, pages))
+    return run_sync(fetch_links(location, pages))
 
 
 def scrape_property_sync(url: str):
-    return asyncio.run(scrape_property(url))
+    return run_sync(scrape_property(url))
 
 
 def scrape_all_sync(location="London", pages=1):
-    return asyncio.run(scrape_all(location, pages))
+    return run_sync(scrape_all(location, pages))
@@ -1,18 +1,30 @@
 # scraper/sources/rightmove_rent_scraper.py
 
 import asyncio
+from functools import partial
+from pathlib import Path
 from typing import List, Dict, Any, Optional, Callable
 
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from .rightmove_scraper import (
-    BASE,
-    launch_browser,
-    accept_cookies,
-    safe_eval,
+    POOL,
+    PROPERTY_CACHE,
+    run_sync,
+    collect_index_links,
+    fetch_links_http,
+    index_page_urls,
+    scroll_and_settle,
     parse_from_body_text,
+    extract_detail_page,
+    extract_detail_text,
+    fetch_property_http,
+    parse_property_data,
     Logger,
     _log,
+    DEFAULT_MAX_CONCURRENCY,
+    scrape_urls,
+    RateLimitedError,
 )
 
 
@@ -31,47 +43,40 @@ async def fetch_rent_links(
     if logger is None:
         logger = print
 
-    pw, browser, page = await launch_browser(logger=logger)
+    links = await fetch_links_http(index_page_urls("property-to-rent", max_pages), logger)
+    if links is not None:
+        logger(f"➡️ {len(links)} RENT-Listings für {location} per HTTP geholt")
+        return links
 
-    logger(f"➡️ Fetching Rightmove *rental* listings for: {location}")
-
-    # TODO: echtes Mapping bauen; aktuell London-Fallback
-    loc_id = "REGION^87490"  # London
-
-    links: List[str] = []
-
-    for p in range(max_pages):
-        # WICHTIG: property-to-rent statt property-for-sale
-        url = f"{BASE}/property-to-rent/find.html?locationIdentifier={loc_id}&index={p * 24}"
-
-        logger(f"📄 Loading RENT listing page: {url}")
-        try:
-            await page.goto(url, timeout=70000, wait_until="domcontentloaded")
-        except PlaywrightTimeoutError as e:
-            logger(f"❌ Timeout loading rent listing page {url}: {e}")
-            continue
-
-        await accept_cookies(page)
-        await page.wait_for_timeout(2000)
-
-        cards = await page.query_selector_all("a.propertyCard-link")
+    context, page = await POOL.acquire(logger=logger)
+    try:
+        return await _fetch_rent_links_on_page(page, location, max_pages, logger)
+    finally:
+        await POOL.release(context)
 
-        for c in cards:
-            href = await c.get_attribute("href")
-            if href and "/properties/" in href:
-                clean = BASE + href.split("?")[0]
-                links.append(clean)
 
-    await browser.close()
-    await pw.stop()
+async def _fetch_rent_links_on_page(
+    page,
+    location: str,
+    max_pages: int,
+    logger: Logger,
+) -> List[str]:
+    logger(f"➡️ Fetching Rightmove *rental* listings for: {location}")
 
-    # dedupe
-    return list(dict.fromkeys(links))
+    # TODO: echtes Mapping bauen; aktuell London-Fallback
+    # WICHTIG: property-to-rent statt property-for-sale
+    return await collect_index_links(
+        page, index_page_urls("property-to-rent", max_pages), logger, label="RENT listing"
+    )
 
 
 # ----------------------------------------------------------
 # SCRAPE ONE RENTAL PROPERTY
 # ----------------------------------------------------------
+# Page-JSON per HTTP zuerst, Playwright nur als Fallback
+fetch_rent_property_http = partial(fetch_property_http, source="rent_v1_http_pagemodel")
+
+
 async def scrape_rent_property(
     url: str,
     logger: Optional[Logger] = None,
@@ -84,15 +89,28 @@ async def scrape_rent_property(
     if logger is None:
         logger = print
 
-    pw, browser, page = await launch_browser(logger=logger)
+    key = (_scrape_rent_property_page, url)
+    data = PROPERTY_CACHE.get(key)
+    if data is not None:
+        return data
+
+    data = await fetch_rent_property_http(url, logger)
+    if data is None:
+        context, page = await POOL.acquire(logger=logger)
+        try:
+            data = await _scrape_rent_property_page(page, url, logger)
+        finally:
+            await POOL.release(context)
+    PROPERTY_CACHE.put(key, data)
+    return data
+
 
+async def _scrape_rent_property_page(page, url: str, logger: Logger) -> Dict[str, Any]:
     logger(f"🏠 [RENT] Scraping: {url}")
     try:
-        await page.goto(url, timeout=70000, wait_until="domcontentloaded")
+        response = await page.goto(url, timeout=70000, wait_until="domcontentloaded")
     except PlaywrightTimeoutError as e:
         logger(f"❌ Timeout loading rent property page {url}: {e}")
-        await browser.close()
-        await pw.stop()
         return {
             "url": url,
             "title": None,
@@ -109,57 +127,58 @@ async def scrape_rent_property(
             "source": "rent_v1_timeout",
             "error": f"timeout: {e}",
         }
-
-    await accept_cookies(page)
+    if response is not None and response.status == 429:
+        raise RateLimitedError(f"HTTP 429 for {url}")
 
     try:
         await page.wait_for_selector("h1", timeout=15000)
     except Exception:
         pass
 
-    await page.wait_for_timeout(1500)
-
-    try:
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await page.wait_for_timeout(1500)
-    except Exception:
-        pass
-
-    # Titel & Adresse
-    title = await safe_eval(page, "h1")
-    address = await safe_eval(page, "[data-testid='address']") \
-        or await safe_eval(page, "[data-testid='address-display']")
+    # Titel & Adresse + Page-JSON
+    fields, prop_data = await extract_detail_page(page)
+    title = fields["title"]
+    address = fields["address"]
+
+    if prop_data:
+        (
+            price,
+            property_type,
+            bedrooms,
+            bathrooms,
+            description,
+            floor_area_sqm,
+            year_built,
+            energy_rating,
+            refurb_intensity,
+        ) = parse_property_data(prop_data)
+        address = address or (prop_data.get("address") or {}).get("displayAddress")
+    else:
+        if not fields["description"]:
+            await scroll_and_settle(page)
+
+        # Text der Detail-Container
+        body_text = await extract_detail_text(page)
+
+        (
+            price,
+            property_type,
+            bedrooms,
+            bathrooms,
+            description,
+            floor_area_sqm,
+            year_built,
+            energy_rating,
+            refurb_intensity,
+        ) = parse_from_body_text(body_text)
+
+        # Fallback Description
+        if not description:
+            description = fields["description"] or ""
 
     if not address and title:
         address = title
 
-    # Volltext
-    try:
-        body_text = await page.inner_text("body")
-    except Exception:
-        body_text = ""
-
-    (
-        price,
-        property_type,
-        bedrooms,
-        bathrooms,
-        description,
-        floor_area_sqm,
-        year_built,
-        energy_rating,
-        refurb_intensity,
-    ) = parse_from_body_text(body_text)
-
-    # Fallback Description
-    if not description:
-        description = await safe_eval(page, "[data-testid='description']") \
-            or await safe_eval(page, "[data-testid='read-full-description']") \
-            or ""
-
-    await browser.close()
-    await pw.stop()
-
     return {
         "url": url,
         "title": title,
@@ -174,7 +193,7 @@ async def scrape_rent_property(
         "year_built": year_built,
         "energy_rating": energy_rating,
         "refurb_intensity": refurb_intensity,
-        "source": "rent_v1_textparse_construction",
+        "source": "rent_v1_pagemodel_construction" if prop_data else "rent_v1_textparse_construction",
     }
 
 
@@ -185,24 +204,32 @@ async def scrape_all_rentals(
     location: str = "London",
     pages: int = 1,
     logger: Optional[Logger] = None,
+    queue: Optional[asyncio.Queue] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    checkpoint_path: Optional[Path] = None,
 ) -> List[Dict[str, Any]]:
+    """
+    queue (optional): jede fertige Zeile wird zusätzlich hineingelegt, damit
+    ein Consumer (z.B. der Ingest in nightly_scrape) schon während des
+    Scrapes arbeiten kann. max_concurrency: gleichzeitig offene Detailseiten.
+    checkpoint_path (optional): .jsonl für Resume, siehe scrape_urls().
+    """
     if logger is None:
         logger = print
 
     links = await fetch_rent_links(location, pages, logger=logger)
     logger(f"📦 [RENT] {len(links)} rental listings found.")
 
-    results: List[Dict[str, Any]] = []
-
-    for idx, url in enumerate(links):
-        logger(f"➡️ [RENT] {idx + 1}/{len(links)} → {url}")
-        try:
-            data = await scrape_rent_property(url, logger=logger)
-            results.append(data)
-        except Exception as e:
-            logger(f"❌ ERROR scraping rent property {url}: {e}")
-
-    return results
+    return await scrape_urls(
+        links,
+        _scrape_rent_property_page,
+        logger,
+        queue=queue,
+        max_concurrency=max_concurrency,
+        prefetch=fetch_rent_property_http,
+        tag="RENT",
+        checkpoint_path=checkpoint_path,
+    )
 
 
 # ----------------------------------------------------------
@@ -213,19 +240,29 @@ def fetch_rent_links_sync(
     pages: int = 1,
     logger: Optional[Logger] = None,
 ) -> List[str]:
-    return asyncio.run(fetch_rent_links(location, pages, logger=logger))
+    return run_sync(fetch_rent_links(location, pages, logger=logger))
 
 
 def scrape_rent_property_sync(
     url: str,
     logger: Optional[Logger] = None,
 ) -> Dict[str, Any]:
-    return asyncio.run(scrape_rent_property(url, logger=logger))
+    return run_sync(scrape_rent_property(url, logger=logger))
 
 
 def scrape_all_rentals_sync(
     location: str = "London",
     pages: int = 1,
     logger: Optional[Logger] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    checkpoint_path: Optional[Path] = None,
 ) -> List[Dict[str, Any]]:
-    return asyncio.run(scrape_all_rentals(location, pages, logger=logger))
+    return run_sync(
+        scrape_all_rentals(
+            location,
+            pages,
+            logger=logger,
+            max_concurrency=max_concurrency,
+            checkpoint_path=checkpoint_path,
+        )
+    )
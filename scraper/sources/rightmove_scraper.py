@@ -1,15 +1,35 @@
 # scraper/sources/rightmove_scraper.py
 
 import asyncio
+import atexit
+import html
+import json
+import os
 import re
+import sqlite3
 import sys
 import subprocess
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Callable
+from itertools import chain
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable, Awaitable, AsyncIterator, Tuple
 
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
+from .scraper_config import SCRAPER_SETTINGS
+
 BASE = "https://www.rightmove.co.uk"
+LONDON_LOCATION_ID = "REGION^87490"
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/123.0.0.0 Safari/537.36"
+)
 
 Logger = Callable[[str], None]
 
@@ -49,87 +69,360 @@ def ensure_browsers_installed(logger: Optional[Logger] = None) -> None:
 # ----------------------------------------------------------
 # Browser Setup
 # ----------------------------------------------------------
-async def launch_browser(logger: Optional[Logger] = None):
-    pw = await async_playwright().start()
+CHROMIUM_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-web-security",
+    "--disable-dev-shm-usage",
+]
 
-    try:
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--disable-web-security",
-                "--disable-dev-shm-usage",
-            ],
-        )
-    except Exception as e:
-        # Typischer Fehler in Cloud-Umgebungen:
-        # "Executable doesn't exist at /home/.../ms-playwright/chromium-..."
-        if "Executable doesn't exist" in str(e):
+# Basic anti-bot hardening (pro Context)
+ANTI_BOT_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+
+    Object.defineProperty(navigator, 'platform', { get: () => 'Win32' });
+    Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
+    Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
+
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications'
+            ? Promise.resolve({ state: Notification.permission })
+            : originalQuery(parameters)
+    );
+"""
+
+# OneTrust-Banner einmal pro Context wegklicken: der Observer läuft in jedem
+# Dokument mit und klickt, sobald der Button auftaucht – statt nach jeder
+# Navigation zwei Locator-Klicks mit je 3 s Timeout abzuwarten.
+CONSENT_INIT_SCRIPT = """
+(() => {
+    const tryClick = () => {
+        const btn = document.querySelector(
+            "#onetrust-accept-btn-handler, button[aria-label='Accept all']"
+        );
+        if (btn) { btn.click(); return true; }
+        return false;
+    };
+    const observer = new MutationObserver(() => {
+        if (tryClick()) observer.disconnect();
+    });
+    document.addEventListener("DOMContentLoaded", () => {
+        if (!tryClick()) {
+            observer.observe(document.documentElement, { childList: true, subtree: true });
+        }
+    });
+})();
+"""
+
+
+# beide Scripts in einem add_init_script(): ein CDP-Call pro neuem Context
+CONTEXT_INIT_SCRIPT = ANTI_BOT_INIT_SCRIPT + "\n" + CONSENT_INIT_SCRIPT
+
+
+async def _start_chromium(
+    logger: Optional[Logger] = None,
+    headless: bool = True,
+    extra_args: Tuple[str, ...] = (),
+):
+    """
+    Einziger Launch-Pfad für Chromium (Pool, launch_browser, BrowserFactory).
+    Fehlt das Browser-Binary, wird einmal installiert und neu gestartet.
+    """
+    args = [*CHROMIUM_ARGS, *extra_args]
+    for attempt in range(2):
+        pw = await async_playwright().start()
+        try:
+            return pw, await pw.chromium.launch(headless=headless, args=args)
+        except Exception as e:
             await pw.stop()
+            # Typischer Fehler in Cloud-Umgebungen:
+            # "Executable doesn't exist at /home/.../ms-playwright/chromium-..."
+            if attempt or "Executable doesn't exist" not in str(e):
+                raise
             ensure_browsers_installed(logger)
 
-            pw = await async_playwright().start()
-            browser = await pw.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-web-security",
-                    "--disable-dev-shm-usage",
-                ],
-            )
-        else:
-            await pw.stop()
-            raise
 
+# Default für alle block_assets-Parameter; pro Aufruf überschreibbar
+BLOCK_ASSETS = SCRAPER_SETTINGS.get("BLOCK_ASSETS", True)
+
+# Für reines Text-Parsing unnötig: Bilder, Fonts, CSS, Video.
+# document/script/xhr/fetch bleiben erlaubt, damit die SPA hydriert.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+# Tracking/Ads liefern nichts für den Parser, halten aber das Netz beschäftigt
+BLOCKED_URL_RE = re.compile("|".join(map(re.escape, (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "hotjar.com",
+    "optimizely.com",
+    "connect.facebook.net",
+    "scorecardresearch.com",
+))))
+
+
+async def block_assets_route(route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _new_context(browser, block_assets: bool = BLOCK_ASSETS):
     context = await browser.new_context(
         viewport={"width": 1600, "height": 1200},
         locale="en-GB",
         java_script_enabled=True,
         bypass_csp=True,
-        user_agent=(
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/123.0.0.0 Safari/537.36"
-        ),
+        user_agent=USER_AGENT,
     )
+    await context.add_init_script(CONTEXT_INIT_SCRIPT)
+    if block_assets:
+        await context.route("**/*", block_assets_route)
+    return context
 
-    # Basic anti-bot hardening
-    await context.add_init_script(
-        """
-        Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-
-        Object.defineProperty(navigator, 'platform', { get: () => 'Win32' });
-        Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
-        Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
-
-        const originalQuery = window.navigator.permissions.query;
-        window.navigator.permissions.query = (parameters) => (
-            parameters.name === 'notifications'
-                ? Promise.resolve({ state: Notification.permission })
-                : originalQuery(parameters)
-        );
-        """
-    )
 
+async def launch_browser(logger: Optional[Logger] = None, block_assets: bool = BLOCK_ASSETS):
+    """Eigener Browser + Page (Standalone-Nutzung); Scraper nutzen POOL."""
+    pw, browser = await _start_chromium(logger)
+    context = await _new_context(browser, block_assets=block_assets)
     page = await context.new_page()
     return pw, browser, page
 
 
-# ----------------------------------------------------------
-# Accept Cookies
-# ----------------------------------------------------------
-async def accept_cookies(page) -> None:
-    try:
-        await page.locator("#onetrust-accept-btn-handler").click(timeout=3000)
-    except Exception:
-        pass
+# Zurückgegebene Contexts, die für den nächsten acquire() warm bleiben
+POOL_IDLE_CONTEXTS = 4
+
+
+class _PoolState:
+    """Browser, Lock und freie Contexts eines Event-Loops."""
+
+    def __init__(self) -> None:
+        self.pw = None
+        self.browser = None
+        self.lock = asyncio.Lock()
+        # block_assets -> freie Contexts (die Route hängt am Context)
+        self.idle: Dict[bool, List[Any]] = {True: [], False: []}
+        self.block_assets: Dict[Any, bool] = {}
+        # hält den Loop-Wächter (async generator) am Leben, s. BrowserPool
+        self.guard = None
+
+    async def close(self, graceful: bool = True) -> None:
+        """
+        graceful=False beim Herunterfahren des Loops: dessen Tasks (auch
+        Playwrights Lese-Task) sind dann schon abgebrochen, browser.close()
+        bekäme keine Antwort mehr. pw.stop() beendet den Treiber, und der
+        nimmt seinen Chromium mit.
+        """
+        browser, pw = self.browser, self.pw
+        self.browser = None
+        self.pw = None
+        self.idle = {True: [], False: []}
+        self.block_assets = {}
+        if graceful and browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if pw is not None:
+            try:
+                await pw.stop()
+            except Exception:
+                pass
+            if not graceful:
+                await _reap_driver(pw)
+
 
+async def _reap_driver(pw) -> None:
+    """
+    Beendeten Treiber-Prozess einsammeln, wenn Playwrights Lese-Task schon
+    abgebrochen ist (sonst meckert der Subprocess-Transport beim GC über
+    den geschlossenen Loop). Greift auf Interna zu, daher nur best effort.
+    """
+    connection = getattr(getattr(pw.stop, "__self__", None), "_connection", None)
+    proc = getattr(getattr(connection, "_transport", None), "_proc", None)
+    if proc is None:
+        return
     try:
-        await page.locator("button[aria-label='Accept all']").click(timeout=3000)
+        await asyncio.wait_for(proc.communicate(), 5)
     except Exception:
         pass
 
 
+class BrowserPool:
+    """
+    Ein warmer Chromium pro Event-Loop statt Kaltstart (1–2 s) pro URL.
+    acquire() gibt einen Context samt frischer Page zurück. release()
+    schließt die Pages, leert die Cookies und legt bis zu POOL_IDLE_CONTEXTS
+    Contexts zur Wiederverwendung zurück (HTTP-Cache, Routen und
+    Init-Scripts bleiben warm); der Rest wird geschlossen.
+
+    Playwright-Objekte hängen an ihrem Loop, daher ein Zustand pro Loop.
+    Endet ein Loop über asyncio.run() (bzw. shutdown_asyncgens()), schließt
+    ein Wächter dessen Browser und Treiber automatisch; wer Loops selbst
+    verwaltet, ruft vorher POOL.shutdown() auf dem Loop auf.
+    """
+
+    def __init__(self) -> None:
+        self._states: Dict[Any, _PoolState] = {}
+        self.contexts_served = 0
+
+    async def _loop_guard(self, state: _PoolState):
+        # Async Generator: der Loop schließt ihn beim Herunterfahren
+        # (shutdown_asyncgens) -> finally räumt den Browser dieses Loops ab
+        try:
+            yield
+        finally:
+            await state.close(graceful=False)
+
+    async def _state(self) -> _PoolState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            # Einträge beendeter Loops nicht ewig mitschleppen
+            for old in [l for l in self._states if l.is_closed()]:
+                del self._states[old]
+            state = self._states[loop] = _PoolState()
+            state.guard = self._loop_guard(state)
+            await state.guard.__anext__()
+        return state
+
+    def _current_state(self) -> Optional[_PoolState]:
+        return self._states.get(asyncio.get_running_loop())
+
+    async def _get_browser(self, logger: Optional[Logger] = None):
+        state = await self._state()
+        async with state.lock:
+            if state.browser is None or not state.browser.is_connected():
+                if state.pw is not None:
+                    # Browser abgestürzt: alten Playwright-Treiber nicht verwaisen lassen
+                    _log(logger, "⚠️ Pool-Browser getrennt – starte neu")
+                    try:
+                        await state.pw.stop()
+                    except Exception:
+                        pass
+                state.pw, state.browser = await _start_chromium(logger)
+                # Contexts des alten Browsers sind tot
+                state.idle = {True: [], False: []}
+                state.block_assets = {}
+        return state, state.browser
+
+    async def acquire(self, logger: Optional[Logger] = None, block_assets: bool = BLOCK_ASSETS):
+        """
+        block_assets=False, falls später Selektoren auf CSS-abhängige
+        Nodes (oder Bilder) angewiesen sind.
+        """
+        state, browser = await self._get_browser(logger)
+        idle = state.idle[block_assets]
+        while idle:
+            context = idle.pop()
+            try:
+                page = await context.new_page()
+            except Exception:
+                state.block_assets.pop(context, None)
+                continue  # Context ist inzwischen kaputt -> nächsten nehmen
+            self.contexts_served += 1
+            return context, page
+
+        try:
+            context = await _new_context(browser, block_assets=block_assets)
+        except Exception:
+            if browser.is_connected():
+                raise
+            # zwischen Check und new_context gestorben -> einmal neu starten
+            state, browser = await self._get_browser(logger)
+            context = await _new_context(browser, block_assets=block_assets)
+        state.block_assets[context] = block_assets
+        self.contexts_served += 1
+        page = await context.new_page()
+        return context, page
+
+    async def release(self, context) -> None:
+        state = self._current_state()
+        block_assets = state.block_assets.get(context) if state is not None else None
+        idle = state.idle.get(block_assets) if block_assets is not None else None
+        if idle is not None and len(idle) < POOL_IDLE_CONTEXTS and state.browser is not None \
+                and state.browser.is_connected():
+            try:
+                for page in list(context.pages):
+                    await page.close()
+                await context.clear_cookies()
+                idle.append(context)
+                return
+            except Exception:
+                pass  # dann eben schließen
+        if state is not None:
+            state.block_assets.pop(context, None)
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def shutdown(self) -> None:
+        """Browser + Treiber des laufenden Loops schließen."""
+        state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is None:
+            return
+        await state.close()
+        # Wächter beenden (sein finally findet nur noch leeren Zustand vor)
+        await state.guard.aclose()
+
+
+POOL = BrowserPool()
+
+
+class LoopRunner:
+    """
+    Ein langlebiger Event-Loop in einem Daemon-Thread für alle Sync-Wrapper.
+    asyncio.run() pro Aufruf würde jedes Mal Loop und damit auch den
+    Pool-Browser neu starten; so bleibt Chromium über Aufrufe (z.B.
+    FastAPI-Requests) hinweg warm. Geschlossen wird einmal per atexit.
+    """
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="rightmove-loop", daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def run(self, coro):
+        """Coroutine auf dem geteilten Loop ausführen und blockierend warten."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def close(self) -> None:
+        if self._loop is None:
+            return
+        try:
+            self.run(POOL.shutdown())
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+
+
+LOOP_RUNNER = LoopRunner()
+atexit.register(LOOP_RUNNER.close)
+
+
+def run_sync(coro):
+    """Für Sync-Wrapper: Coroutine auf dem warmen Loop (samt Browser) ausführen."""
+    return LOOP_RUNNER.run(coro)
+
+
 # ----------------------------------------------------------
 # Safe innerText evaluator
 # ----------------------------------------------------------
@@ -145,21 +438,251 @@ async def safe_eval(page, selector: str) -> Optional[str]:
     return None
 
 
+# Titel, Adresse und Description-Fallback in einem evaluate() statt
+# einzelner query_selector/inner_text-Roundtrips pro Selektor
+DETAIL_FIELDS_JS = """
+() => {
+    const text = (sel) => {
+        const el = document.querySelector(sel);
+        const t = el && el.innerText && el.innerText.trim();
+        return t || null;
+    };
+    return {
+        title: text("h1"),
+        address: text("[data-testid='address']") || text("[data-testid='address-display']"),
+        description: text("[data-testid='description']")
+            || text("[data-testid='read-full-description']"),
+    };
+}
+"""
+
+
+# ----------------------------------------------------------
+# Gezielte Waits statt fester Sleeps
+# ----------------------------------------------------------
+LISTING_CARD_SELECTOR = "a.propertyCard-link"
+
+
+async def wait_for_listing_cards(page, timeout: int = 10000) -> bool:
+    """
+    Wartet, bis die Ergebnis-Karten im DOM sind (statt pauschal 2 s).
+    False bei leerer Seite / anderem Layout – dann gibt es nichts zu extrahieren.
+    """
+    try:
+        await page.wait_for_selector(LISTING_CARD_SELECTOR, state="attached", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+async def extract_listing_links(page) -> List[str]:
+    """
+    Alle Karten-hrefs in einem einzigen CDP-Call holen (statt
+    query_selector_all + get_attribute pro Karte), Filter in Python.
+    """
+    hrefs = await page.eval_on_selector_all(
+        LISTING_CARD_SELECTOR, "els => els.map(e => e.getAttribute('href'))"
+    )
+    return [
+        BASE + href.split("?")[0]
+        for href in hrefs
+        if href and "/properties/" in href
+    ]
+
+
+GOTO_TIMEOUT = 70000
+GOTO_ATTEMPTS = 3
+GOTO_BASE_DELAY = 1.0
+
+
+async def goto_with_retry(
+    page,
+    url: str,
+    logger: Logger,
+    attempts: int = GOTO_ATTEMPTS,
+) -> bool:
+    """
+    page.goto mit Backoff (1s, 2s, 4s, ...) bei Timeouts, damit ein
+    einzelner Hänger nicht gleich die ganze Index-Seite kostet.
+    False, wenn alle Versuche scheitern.
+    """
+    for attempt in range(attempts):
+        try:
+            await page.goto(url, timeout=GOTO_TIMEOUT, wait_until="domcontentloaded")
+            return True
+        except PlaywrightTimeoutError as e:
+            if attempt == attempts - 1:
+                logger(f"❌ Timeout loading {url} ({attempts} Versuche): {e}")
+                return False
+            delay = 2 ** attempt * GOTO_BASE_DELAY
+            logger(f"🔁 Timeout loading {url}, Versuch {attempt + 2}/{attempts} in {delay:.0f}s")
+            await asyncio.sleep(delay)
+    return False
+
+
+# Index-Seiten im Browser-Fallback parallel (eigene Pages im selben Context)
+INDEX_PAGE_CONCURRENCY = 3
+
+
+async def collect_index_links(
+    page,
+    urls: List[str],
+    logger: Logger,
+    label: str = "listing",
+    concurrency: int = INDEX_PAGE_CONCURRENCY,
+) -> List[str]:
+    """
+    Lädt die Index-Seiten mit bis zu `concurrency` Pages gleichzeitig
+    (page + weitere aus page.context) und liefert die Listing-Links
+    dedupliziert in Seiten- und Kartenreihenfolge. Seiten, die nicht laden
+    oder keine Karten haben, werden geloggt und übersprungen.
+    """
+    idle = [page]
+    extra_pages = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def _load(url: str) -> List[str]:
+        async with slots:
+            if idle:
+                pg = idle.pop()
+            else:
+                pg = await page.context.new_page()
+                extra_pages.append(pg)
+            try:
+                logger(f"📄 Loading {label} page: {url}")
+                if not await goto_with_retry(pg, url, logger):
+                    # nächste Seite probieren, aber NICHT den ganzen Run crashen
+                    return []
+                if not await wait_for_listing_cards(pg):
+                    logger(f"⚠️ Keine Listing-Karten auf {url}")
+                    return []
+                return await extract_listing_links(pg)
+            finally:
+                idle.append(pg)
+
+    try:
+        results = await asyncio.gather(*(_load(url) for url in urls))
+    finally:
+        for pg in extra_pages:
+            try:
+                await pg.close()
+            except Exception:
+                pass
+
+    # dict als geordnetes Set: O(1)-Dedup, Kartenreihenfolge bleibt
+    return list(dict.fromkeys(chain.from_iterable(results)))
+
+
+async def scroll_and_settle(page, timeout: int = 3000) -> None:
+    """
+    Lazy Load per Scroll anstoßen, dann warten, bis die dadurch ausgelösten
+    Requests durch sind (networkidle, gedeckelt auf timeout). readyState
+    allein ist nach domcontentloaded meist schon "complete" und wartet
+    nicht auf nachgeladene Blöcke.
+    """
+    try:
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+    except Exception:
+        pass  # Timeout: weiter mit dem, was bis dahin im DOM ist
+
+
+# ----------------------------------------------------------
+# Index-Seiten per HTTP statt Browser
+# ----------------------------------------------------------
+# Die Ergebnisseiten sind serverseitig gerendert: für die Karten-hrefs
+# braucht es kein JS. Nur bei Bot-Challenge / leerem Ergebnis geht es
+# zurück auf den Playwright-Pfad.
+HTTP_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept-Language": "en-GB,en;q=0.9",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+HTTP_TIMEOUT = 20
+
+# eine Session = ein Connection-Pool (Keep-Alive) für Index- und Detailseiten
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.headers.update(HTTP_HEADERS)
+_HTTP_SESSION.mount(
+    "https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+)
+
+
+def index_page_urls(channel: str, max_pages: int, loc_id: str = LONDON_LOCATION_ID) -> List[str]:
+    """channel: "property-for-sale" oder "property-to-rent"."""
+    return [
+        f"{BASE}/{channel}/find.html?locationIdentifier={loc_id}&index={p * 24}"
+        for p in range(max_pages)
+    ]
+
+
+LINK_STRAINER = SoupStrainer("a")
+
+
+def parse_listing_links(page_html: str) -> List[str]:
+    """HTML-Gegenstück zu extract_listing_links()."""
+    # nur <a>-Tags in den Baum: der Rest der Seite wird getokenized, aber
+    # nicht als Objekte aufgebaut (~2,5x schneller als der volle Parse)
+    soup = BeautifulSoup(page_html, "html.parser", parse_only=LINK_STRAINER)
+    return [
+        BASE + href.split("?")[0]
+        for href in (a.get("href") for a in soup.select(LISTING_CARD_SELECTOR))
+        if href and "/properties/" in href
+    ]
+
+
+def _get_index_links(url: str) -> Optional[List[str]]:
+    try:
+        resp = _HTTP_SESSION.get(url, timeout=HTTP_TIMEOUT)
+    except requests.RequestException:
+        return None
+    if resp.status_code != 200:
+        return None
+    return parse_listing_links(resp.text) or None
+
+
+async def fetch_links_http(urls: List[str], logger: Logger) -> Optional[List[str]]:
+    """
+    Lädt alle Index-Seiten parallel per HTTP. None, sobald eine Seite
+    nicht geht oder keine Karten enthält (Bot-Challenge, JS-Layout) –
+    dann soll der Aufrufer den Browser nehmen.
+    """
+    results = await asyncio.gather(*(asyncio.to_thread(_get_index_links, u) for u in urls))
+    if any(r is None for r in results):
+        logger("⚠️ HTTP-Index ohne Karten (Bot-Challenge?) – Fallback auf Playwright")
+        return None
+    # Karten tauchen auf mehreren Index-Seiten auf (Featured) -> hier einmal dedupen
+    return list(dict.fromkeys(chain.from_iterable(results)))
+
+
 # ----------------------------------------------------------
 # Construction-Helper (Wohnfläche, Baujahr, EPC, Zustand)
 # ----------------------------------------------------------
 
+# Rückgabe-Tupel der Parser (Tupel statt dict: keine Key-Hashes pro Feld)
+# price, property_type, bedrooms, bathrooms, description
+ListingFields = Tuple[Optional[str], Optional[str], Optional[str], Optional[str], str]
+# floor_area_sqm, year_built, energy_rating, refurb_intensity
+ConstructionFields = Tuple[Optional[float], Optional[int], Optional[str], str]
+ParsedFields = Tuple[
+    Optional[str], Optional[str], Optional[str], Optional[str], str,
+    Optional[float], Optional[int], Optional[str], str,
+]
+
+# Alle Patterns einmal beim Import kompiliert (nicht pro Aufruf/Zeile)
 AREA_PATTERNS = [
-    r"(?P<value>\d[\d,\.]*)\s*(sq\.?\s*ft|sqft|sq ft)",
-    r"(?P<value>\d[\d,\.]*)\s*(sq\.?\s*m|sqm|sq m)",
+    re.compile(r"(?P<value>\d[\d,\.]*)\s*(sq\.?\s*ft|sqft|sq ft)"),
+    re.compile(r"(?P<value>\d[\d,\.]*)\s*(sq\.?\s*m|sqm|sq m)"),
 ]
 
 YEAR_PATTERNS = [
-    r"built in\s+(?P<year>19\d{2}|20\d{2})",
-    r"built circa\s+(?P<year>19\d{2}|20\d{2})",
-    r"circa\s+(?P<year>19\d{2}|20\d{2})",
+    re.compile(r"built in\s+(?P<year>19\d{2}|20\d{2})"),
+    re.compile(r"built circa\s+(?P<year>19\d{2}|20\d{2})"),
+    re.compile(r"circa\s+(?P<year>19\d{2}|20\d{2})"),
 ]
 
+EPC_SHORT_RE = re.compile(r"epc[^a-g]*([a-g])")
+
 
 def _clean_number(num_str: str) -> Optional[float]:
     try:
@@ -177,8 +700,12 @@ def extract_floor_area_sqm(text: str) -> Optional[float]:
         return None
 
     t = text.lower()
+    # beide Patterns brauchen "sq", beginnen aber mit einer Zahl: ohne Literal-
+    # Präfix setzt SRE an jeder Textposition an – str-Suche ist ~15x schneller
+    if "sq" not in t:
+        return None
     for pattern in AREA_PATTERNS:
-        m = re.search(pattern, t)
+        m = pattern.search(t)
         if not m:
             continue
         val = _clean_number(m.group("value"))
@@ -205,7 +732,7 @@ def extract_year_built(text: str) -> Optional[int]:
 
     t = text.lower()
     for pattern in YEAR_PATTERNS:
-        m = re.search(pattern, t)
+        m = pattern.search(t)
         if m:
             try:
                 year = int(m.group("year"))
@@ -224,71 +751,159 @@ def extract_energy_rating(text: str) -> Optional[str]:
         return None
 
     t = text.lower()
-    m = re.search(r"epc[^a-g]*([a-g])", t)
-    if m:
-        rating = m.group(1).upper()
-        if rating in list("ABCDEFG"):
-            return rating
-    return None
-
-
-def infer_refurb_intensity(text: str) -> str:
-    """
-    Sehr einfache Heuristik für Refurb-Intensity basierend auf Beschreibung.
-    """
-    if not text:
-        return "none"
+    m = EPC_SHORT_RE.search(t)
+    # die Gruppe matcht nur [a-g] -> kein weiterer A–G-Check nötig
+    return m.group(1).upper() if m else None
+
+
+def _refurb_tier(text: str, tiers) -> str:
+    # Reihenfolge = Priorität: die erste Stufe mit Treffer gewinnt.
+    # Bewusst `in` statt Regex: str-Suche (C, Two-Way/Boyer-Moore-artig)
+    # ist hier ~3x schneller als eine kompilierte Alternation pro Stufe.
+    for tier, terms in tiers:
+        if any(term in text for term in terms):
+            return tier
+    return "none"
 
-    t = text.lower()
 
+REFURB_TIERS = (
     # Full Refurb nötig
-    full_keywords = [
+    ("full", [
         "requires complete refurbishment",
         "in need of complete refurbishment",
         "in need of modernisation",
         "requires modernisation",
         "full refurbishment",
         "total renovation",
-    ]
-    if any(k in t for k in full_keywords):
-        return "full"
-
+    ]),
     # Medium
-    medium_keywords = [
+    ("medium", [
         "scope for improvement",
         "some updating required",
         "tired condition",
         "outdated",
         "dated interior",
-    ]
-    if any(k in t for k in medium_keywords):
-        return "medium"
-
+    ]),
     # Light / schon gemacht
-    light_keywords = [
+    ("light", [
         "recently refurbished",
         "newly refurbished",
         "newly renovated",
         "recently renovated",
         "brand new kitchen",
         "new bathroom",
-    ]
-    if any(k in t for k in light_keywords):
-        return "light"
+    ]),
+)
 
-    return "none"
+
+def infer_refurb_intensity(text: str) -> str:
+    """
+    Sehr einfache Heuristik für Refurb-Intensity basierend auf Beschreibung.
+    """
+    if not text:
+        return "none"
+
+    return _refurb_tier(text.lower(), REFURB_TIERS)
 
 
 # ----------------------------------------------------------
 # Helper: parse property fields from full body text
 # ----------------------------------------------------------
-def parse_from_body_text(body_text: str):
+PRICE_RE = re.compile(r"£\s*[\d,]+")
+NUM_RE = re.compile(r"\d+")
+# "4 bedrooms" / "2 bathrooms" in einem Scan; kein Zeilenumbruch zwischen Zahl und Wort
+ROOMS_RE = re.compile(r"(\d+)[^\S\r\n]*(bed|bath)rooms?", re.I)
+
+
+def _first_number(s: str) -> Optional[str]:
+    """Erste Ziffernfolge in s. Die Zeile nach dem Label ist meist nur "4" –
+    dafür reicht isdecimal() (= \\d), ohne Regex-Aufruf."""
+    if s.isdecimal():
+        return s
+    m = NUM_RE.search(s)
+    return m.group(0) if m else None
+
+
+NON_NUMERIC_RE = re.compile(r"[^\d\.]")
+AREA_SQM_RE = re.compile(
+    r"([\d,\.]+)\s*(?:sq\.?\s*m|sqm|square metres?|square meters?)", re.I
+)
+AREA_SQFT_RE = re.compile(r"([\d,\.]+)\s*(?:sq\.?\s*ft|sqft|square feet)", re.I)
+YEAR_BUILT_RE = re.compile(
+    r"(?:built|constructed|erected|completed)\s+(?:in\s+)?(19\d{2}|20\d{2})", re.I
+)
+YEAR_BUILT_WORDS = ("built", "constructed", "erected", "completed")
+YEAR_CIRCA_RE = re.compile(r"circa\s+(19\d{2}|20\d{2})", re.I)
+EPC_RE = re.compile(
+    r"(?:EPC|Energy (?:Performance )?Rating|Energy rating)\s*[:\-]?\s*([A-G][\+\-]?)", re.I
+)
+
+DESCRIPTION_STOP_MARKERS = (
+    "COUNCIL TAX",
+    "ENERGY PERFORMANCE CERTIFICATE",
+    "UTILITIES, RIGHTS & RESTRICTIONS",
+    "CHECK HOW MUCH YOU CAN BORROW",
+    "ABOUT ",
+)
+# Eine Alternation = ein Scan pro Zeile statt einem pro Marker
+DESCRIPTION_STOP_RE = re.compile("|".join(map(re.escape, DESCRIPTION_STOP_MARKERS)))
+
+# Refurb-Stufen für den Body-Text-Parser (eigene, etwas breitere Begriffe)
+BODY_REFURB_TIERS = (
+    ("full", [
+        "in need of modernisation",
+        "in need of modernization",
+        "requires modernisation",
+        "requires modernization",
+        "complete refurbishment",
+        "full refurbishment",
+        "total refurbishment",
+        "unmodernised",
+        "unmodernized",
+        "shell condition",
+    ]),
+    ("medium", [
+        "requires some updating",
+        "scope to improve",
+        "scope for improvement",
+        "dated condition",
+        "requires updating",
+        "needs updating",
+    ]),
+    ("light", [
+        "newly refurbished",
+        "recently refurbished",
+        "newly renovated",
+        "recently renovated",
+        "immaculate condition",
+        "turn-key",
+        "turnkey",
+        "ready to move in",
+    ]),
+)
+
+
+def parse_from_body_text(body_text: str) -> ParsedFields:
     """
     Verwendet den reinen Body-Text, um price, property_type,
     bedrooms, bathrooms, description + floor_area_sqm, year_built,
     energy_rating und refurb_intensity herauszuziehen.
     """
-    lines = [l.strip() for l in body_text.splitlines() if l.strip()]
+    # eine kleingeschriebene Kopie für die Literal-Screens beider Parser
+    lower = body_text.lower()
+    listing_fields = parse_listing_fields(body_text, lower)
+    description = listing_fields[4]
+    return listing_fields + parse_construction_fields(body_text, description, lower)
+
+
+def parse_listing_fields(body_text: str, lower: Optional[str] = None) -> ListingFields:
+    """
+    Nur price, property_type, bedrooms, bathrooms, description – für
+    Aufrufer, die die Construction-Felder selbst (anders) bestimmen.
+    lower: optional schon berechnetes body_text.lower().
+    """
+    # strip() nur einmal pro Zeile statt für Filter und Wert getrennt
+    lines = [l for l in map(str.strip, body_text.splitlines()) if l]
 
     price = None
     property_type = None
@@ -296,87 +911,89 @@ def parse_from_body_text(body_text: str):
     bathrooms = None
     description = ""
 
-    floor_area_sqm = None
-    year_built = None
-    energy_rating = None
-    refurb_intensity = "none"
+    # --- Ein Durchlauf über alle Zeilen statt sechs einzelner Scans ---
+    # price:         erste Zeile, die mit £ beginnt
+    # property_type: Zeile nach "PROPERTY TYPE"
+    # bedrooms/-baths: Zahl in der Zeile nach "BEDROOMS"/"BATHROOMS"
+    # description:   alles nach "Description" bis zum nächsten Block/Meta
+    n_lines = len(lines)
+    in_desc = False
+    desc_done = False
+    desc_lines = []
+    for idx, l in enumerate(lines):
+        upper = l.upper()  # einzige Case-Konvertierung pro Zeile
 
-    # --- PRICE: erste Zeile, die mit £ beginnt ---
-    for l in lines:
-        if l.startswith("£"):
-            m = re.search(r"£\s*[\d,]+", l)
+        if price is None and l[0] == "£":  # Zeilen sind nie leer (Filter oben)
+            m = PRICE_RE.search(l)
             if m:
                 price = m.group(0)
-                break
-
-    # --- PROPERTY TYPE: Zeile nach "PROPERTY TYPE" ---
-    for idx, l in enumerate(lines):
-        if l.upper() == "PROPERTY TYPE" and idx + 1 < len(lines):
-            property_type = lines[idx + 1]
-            break
-
-    # --- BEDROOMS: nach "BEDROOMS" oder "10 bedrooms" etc. ---
-    if not bedrooms:
-        for idx, l in enumerate(lines):
-            if l.upper() == "BEDROOMS" and idx + 1 < len(lines):
-                m = re.search(r"\d+", lines[idx + 1])
-                if m:
-                    bedrooms = m.group(0)
-                    break
-    if not bedrooms:
-        for l in lines:
-            m = re.search(r"(\d+)\s*bedrooms?", l, re.I)
-            if m:
-                bedrooms = m.group(1)
-                break
 
-    # --- BATHROOMS ---
-    if not bathrooms:
-        for idx, l in enumerate(lines):
-            if l.upper() == "BATHROOMS" and idx + 1 < len(lines):
-                m = re.search(r"\d+", lines[idx + 1])
-                if m:
-                    bathrooms = m.group(0)
-                    break
-    if not bathrooms:
-        for l in lines:
-            m = re.search(r"(\d+)\s*bathrooms?", l, re.I)
-            if m:
-                bathrooms = m.group(1)
+        if idx + 1 < n_lines:
+            if property_type is None and upper == "PROPERTY TYPE":
+                property_type = lines[idx + 1]
+            elif bedrooms is None and upper == "BEDROOMS":
+                bedrooms = _first_number(lines[idx + 1])
+            elif bathrooms is None and upper == "BATHROOMS":
+                bathrooms = _first_number(lines[idx + 1])
+
+        if desc_done:
+            # alles gefunden -> Rest der Seite (Footer, Nachbar-Listings) überspringen
+            if None not in (price, property_type, bedrooms, bathrooms):
                 break
-
-    # --- DESCRIPTION: alles nach "Description" bis zum nächsten Block/Meta ---
-    in_desc = False
-    desc_lines = []
-    for l in lines:
-        lower = l.lower()
-        upper = l.upper()
-
+            continue
         if not in_desc:
-            if lower.startswith("description"):
+            if upper.startswith("DESCRIPTION"):
                 in_desc = True
             continue
-
-        stop_markers = [
-            "COUNCIL TAX",
-            "ENERGY PERFORMANCE CERTIFICATE",
-            "UTILITIES, RIGHTS & RESTRICTIONS",
-            "CHECK HOW MUCH YOU CAN BORROW",
-            "ABOUT ",
-        ]
-        if any(sm in upper for sm in stop_markers):
-            break
-
+        if DESCRIPTION_STOP_RE.search(upper):
+            desc_done = True
+            continue
         desc_lines.append(l)
 
+    # Fallback "10 bedrooms" etc. nur, wenn es kein Label gab
+    # (Literal-Screen vorab: ROOMS_RE beginnt mit \d, SRE müsste jede Position probieren;
+    # lower() nur, wenn der Fallback überhaupt nötig ist)
+    if not (bedrooms and bathrooms):
+        if lower is None:
+            lower = body_text.lower()
+        if "room" in lower:
+            for m in ROOMS_RE.finditer(body_text):
+                if m.group(2).lower() == "bed":
+                    bedrooms = bedrooms or m.group(1)
+                else:
+                    bathrooms = bathrooms or m.group(1)
+                if bedrooms and bathrooms:
+                    break
+
     if desc_lines:
         description = "\n".join(desc_lines).strip()
 
+    return price, property_type, bedrooms, bathrooms, description
+
+
+def parse_construction_fields(
+    body_text: str,
+    description: str,
+    lower: Optional[str] = None,
+) -> ConstructionFields:
+    """
+    floor_area_sqm, year_built, energy_rating, refurb_intensity aus dem Body-Text.
+    lower: optional schon berechnetes body_text.lower().
+    """
+    floor_area_sqm = None
+    year_built = None
+    energy_rating = None
+
+    # Literal-Screens auf dem kleingeschriebenen Text: jede Regex unten braucht
+    # eines dieser Wörter, ohne Treffer spart str-Suche den ganzen Regex-Scan
+    if lower is None:
+        lower = body_text.lower()
+
     # ====================================================
     # 🆕 Floor area (sq ft / sq m)
     # ====================================================
     def _parse_number(s: str) -> float | None:
-        s_clean = re.sub(r"[^\d\.]", "", s)
+        s_clean = NON_NUMERIC_RE.sub("", s)
         if not s_clean:
             return None
         try:
@@ -385,22 +1002,14 @@ def parse_from_body_text(body_text: str):
             return None
 
     # zuerst nach m² suchen
-    m2_match = re.search(
-        r"([\d,\.]+)\s*(?:sq\.?\s*m|sqm|square metres?|square meters?)",
-        body_text,
-        flags=re.I,
-    )
+    m2_match = AREA_SQM_RE.search(body_text) if "sq" in lower else None
     if m2_match:
         val = _parse_number(m2_match.group(1))
         if val:
             floor_area_sqm = val
-    else:
+    elif "sq" in lower:
         # dann sq ft → in m² umrechnen
-        ft_match = re.search(
-            r"([\d,\.]+)\s*(?:sq\.?\s*ft|sqft|square feet)",
-            body_text,
-            flags=re.I,
-        )
+        ft_match = AREA_SQFT_RE.search(body_text)
         if ft_match:
             val = _parse_number(ft_match.group(1))
             if val:
@@ -409,17 +1018,11 @@ def parse_from_body_text(body_text: str):
     # ====================================================
     # 🆕 Year built
     # ====================================================
-    year_match = re.search(
-        r"(?:built|constructed|erected|completed)\s+(?:in\s+)?(19\d{2}|20\d{2})",
-        body_text,
-        flags=re.I,
-    )
-    if not year_match:
-        year_match = re.search(
-            r"circa\s+(19\d{2}|20\d{2})",
-            body_text,
-            flags=re.I,
-        )
+    year_match = None
+    if any(word in lower for word in YEAR_BUILT_WORDS):
+        year_match = YEAR_BUILT_RE.search(body_text)
+    if not year_match and "circa" in lower:
+        year_match = YEAR_CIRCA_RE.search(body_text)
     if year_match:
         try:
             year_built = int(year_match.group(1))
@@ -429,58 +1032,146 @@ def parse_from_body_text(body_text: str):
     # ====================================================
     # 🆕 Energy / EPC rating
     # ====================================================
-    epc_match = re.search(
-        r"(?:EPC|Energy (?:Performance )?Rating|Energy rating)\s*[:\-]?\s*([A-G][\+\-]?)",
-        body_text,
-        flags=re.I,
-    )
+    epc_match = EPC_RE.search(body_text) if "epc" in lower or "energy" in lower else None
     if epc_match:
         energy_rating = epc_match.group(1).upper()
 
     # ====================================================
     # 🆕 Refurb intensity heuristic (aus Beschreibung)
     # ====================================================
-    text = (description or body_text).lower()
+    text = description.lower() if description else lower
+    refurb_intensity = _refurb_tier(text, BODY_REFURB_TIERS)
 
-    full_terms = [
-        "in need of modernisation",
-        "in need of modernization",
-        "requires modernisation",
-        "requires modernization",
-        "complete refurbishment",
-        "full refurbishment",
-        "total refurbishment",
-        "unmodernised",
-        "unmodernized",
-        "shell condition",
-    ]
-    medium_terms = [
-        "requires some updating",
-        "scope to improve",
-        "scope for improvement",
-        "dated condition",
-        "requires updating",
-        "needs updating",
-    ]
-    light_terms = [
-        "newly refurbished",
-        "recently refurbished",
-        "newly renovated",
-        "recently renovated",
-        "immaculate condition",
-        "turn-key",
-        "turnkey",
-        "ready to move in",
-    ]
+    return floor_area_sqm, year_built, energy_rating, refurb_intensity
 
-    if any(t in text for t in full_terms):
-        refurb_intensity = "full"
-    elif any(t in text for t in medium_terms):
-        refurb_intensity = "medium"
-    elif any(t in text for t in light_terms):
-        refurb_intensity = "light"
-    else:
-        refurb_intensity = "none"
+
+# ----------------------------------------------------------
+# Helper: strukturierte Daten aus dem eingebetteten Page-JSON
+# ----------------------------------------------------------
+# Rightmove liefert die Detailseite aktuell mit window.PAGE_MODEL aus,
+# __NEXT_DATA__ prüfen wir trotzdem zuerst (Next.js-Variante der Seite).
+PROPERTY_DATA_JS = """
+() => {
+    const next = document.getElementById("__NEXT_DATA__");
+    if (next) {
+        try {
+            const data = JSON.parse(next.textContent);
+            const prop = data.props && data.props.pageProps && data.props.pageProps.propertyData;
+            if (prop) return prop;
+        } catch (e) {}
+    }
+    return (window.PAGE_MODEL && window.PAGE_MODEL.propertyData) || null;
+}
+"""
+
+HTML_BREAK_RE = re.compile(r"<br\s*/?>", re.I)
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+
+# Felder + Page-JSON in einem einzigen evaluate()/CDP-Roundtrip
+DETAIL_PAGE_JS = f"""
+() => ({{
+    fields: ({DETAIL_FIELDS_JS.strip()})(),
+    property_data: ({PROPERTY_DATA_JS.strip()})(),
+}})
+"""
+
+EMPTY_DETAIL_FIELDS = {"title": None, "address": None, "description": None}
+
+
+async def extract_detail_page(page) -> Tuple[Dict[str, Optional[str]], Optional[Dict[str, Any]]]:
+    """
+    ({title, address, description}, propertyData) der Detailseite.
+    Fehlende Felder = None; propertyData None, wenn die Seite kein
+    Page-JSON mitliefert – dann Body-Text-Fallback.
+    """
+    try:
+        bundle = await page.evaluate(DETAIL_PAGE_JS)
+    except Exception:
+        bundle = None
+    if not isinstance(bundle, dict):
+        return dict(EMPTY_DETAIL_FIELDS), None
+    fields = bundle.get("fields")
+    prop = bundle.get("property_data")
+    if not isinstance(fields, dict):
+        fields = dict(EMPTY_DETAIL_FIELDS)
+    return fields, prop if isinstance(prop, dict) else None
+
+
+# Preis-Panel, Info-Reel (Typ/Zimmer/Größe), Key Features + Beschreibung
+# liegen jeweils in einem <article> unter <main>; Nav, Footer, Ads und
+# Nachbar-Listings nicht. Liefert ~1/3 des Body-Texts bei gleichem Parse.
+DETAIL_TEXT_SELECTOR = "h1, main article"
+
+# Obergrenze für den Detail-Text: alle Felder stehen weit vorne, ein
+# entgleister Body (Endlos-Listen, eingebettete Daten) soll weder den
+# CDP-Transfer noch den Parser aufblähen
+MAX_DETAIL_TEXT_CHARS = 512 * 1024
+
+# Container-Text und Body-Fallback in einem evaluate(): kein zweiter
+# CDP-Roundtrip, wenn das Layout keine <main>-Artikel hat. Gekürzt wird
+# schon im Browser, bevor der String serialisiert wird.
+DETAIL_TEXT_JS = """
+([selector, maxChars]) => {
+    const parts = Array.from(document.querySelectorAll(selector))
+        .map((e) => e.innerText)
+        .filter(Boolean);
+    let text = parts.join("\\n");
+    if (!text.trim()) text = document.body ? document.body.innerText : "";
+    return text.slice(0, maxChars);
+}
+"""
+
+
+async def extract_detail_text(page) -> str:
+    """Text nur der Detail-Container; Body als Fallback bei anderem Layout."""
+    try:
+        text = await page.evaluate(DETAIL_TEXT_JS, [DETAIL_TEXT_SELECTOR, MAX_DETAIL_TEXT_CHARS])
+    except Exception:
+        return ""
+    return text if isinstance(text, str) else ""
+
+
+def _html_to_text(raw: Optional[str]) -> str:
+    if not raw:
+        return ""
+    text = HTML_TAG_RE.sub("", HTML_BREAK_RE.sub("\n", raw))
+    lines = (l.strip() for l in html.unescape(text).splitlines())
+    return "\n".join(l for l in lines if l)
+
+
+def parse_property_data(prop: Dict[str, Any]) -> ParsedFields:
+    """
+    Gegenstück zu parse_from_body_text() für propertyData aus dem Page-JSON.
+    Gleiches Rückgabe-Tupel; Construction-Felder kommen aus Beschreibung
+    + Key Features, die Fläche bevorzugt aus den strukturierten sizings.
+    """
+    prices = prop.get("prices") or {}
+    m = PRICE_RE.search(prices.get("primaryPrice") or "")
+    price = m.group(0) if m else None
+
+    property_type = prop.get("propertySubType") or None
+    bedrooms = prop.get("bedrooms")
+    bathrooms = prop.get("bathrooms")
+    # gleiche Typen wie der Text-Parser (Strings)
+    bedrooms = str(bedrooms) if bedrooms is not None else None
+    bathrooms = str(bathrooms) if bathrooms is not None else None
+
+    description = _html_to_text((prop.get("text") or {}).get("description"))
+    features = "\n".join(prop.get("keyFeatures") or [])
+    text = f"{description}\n\n{features}"
+
+    floor_area_sqm = None
+    try:
+        for sizing in prop.get("sizings") or []:
+            if sizing.get("unit") == "sqm" and sizing.get("minimumSize"):
+                # "1,062" kommt auch als String vor
+                floor_area_sqm = float(str(sizing["minimumSize"]).replace(",", ""))
+                break
+    except (AttributeError, TypeError, ValueError):
+        floor_area_sqm = None  # unerwartete Form -> Fläche aus dem Text
+    if floor_area_sqm is None:
+        floor_area_sqm = extract_floor_area_sqm(text)
 
     return (
         price,
@@ -489,12 +1180,109 @@ def parse_from_body_text(body_text: str):
         bathrooms,
         description,
         floor_area_sqm,
-        year_built,
-        energy_rating,
-        refurb_intensity,
+        extract_year_built(text),
+        extract_energy_rating(text),
+        infer_refurb_intensity(text),
     )
 
 
+# ----------------------------------------------------------
+# Detailseiten per HTTP: Page-JSON direkt aus dem HTML
+# ----------------------------------------------------------
+# PAGE_MODEL steht als Inline-Script im serverseitigen HTML – dafür braucht
+# es weder Chromium noch JS. Playwright bleibt Fallback (kein JSON, Challenge).
+PAGE_MODEL_RE = re.compile(r"window\.PAGE_MODEL\s*=\s*")
+NEXT_DATA_RE = re.compile(
+    r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S
+)
+_JSON_DECODER = json.JSONDecoder()
+
+
+def property_data_from_html(page_html: str) -> Optional[Dict[str, Any]]:
+    """propertyData aus __NEXT_DATA__ bzw. window.PAGE_MODEL, sonst None."""
+    m = NEXT_DATA_RE.search(page_html)
+    if m:
+        try:
+            prop = _JSON_DECODER.decode(m.group(1))["props"]["pageProps"]["propertyData"]
+            if isinstance(prop, dict):
+                return prop
+        except (ValueError, KeyError, TypeError):
+            pass
+
+    m = PAGE_MODEL_RE.search(page_html)
+    if m:
+        try:
+            # raw_decode liest genau ein JSON-Objekt, egal was danach im Script steht
+            model, _ = _JSON_DECODER.raw_decode(page_html, m.end())
+            prop = model.get("propertyData")
+            if isinstance(prop, dict):
+                return prop
+        except (ValueError, AttributeError):
+            pass
+    return None
+
+
+def _get_property_data(url: str) -> Optional[Dict[str, Any]]:
+    try:
+        resp = _HTTP_SESSION.get(url, timeout=HTTP_TIMEOUT)
+    except requests.RequestException:
+        return None
+    if resp.status_code == 429:
+        raise RateLimitedError(f"HTTP 429 for {url}")
+    if resp.status_code != 200:
+        return None
+    return property_data_from_html(resp.text)
+
+
+async def fetch_property_http(
+    url: str,
+    logger: Optional[Logger] = None,
+    source: str = "v4.8_http_pagemodel",
+) -> Optional[Dict[str, Any]]:
+    """
+    Detailseite ohne Browser. None -> Aufrufer nimmt Playwright
+    (kein Page-JSON, Fehlerseite). Ein 429 geht als RateLimitedError an
+    den Aufrufer: Chromium würde denselben Host sofort wieder treffen.
+    """
+    prop = await asyncio.to_thread(_get_property_data, url)
+    if prop is None:
+        return None
+
+    try:
+        (
+            price,
+            property_type,
+            bedrooms,
+            bathrooms,
+            description,
+            floor_area_sqm,
+            year_built,
+            energy_rating,
+            refurb_intensity,
+        ) = parse_property_data(prop)
+        address = (prop.get("address") or {}).get("displayAddress")
+    except Exception as e:
+        # Page-JSON in unerwarteter Form -> lieber Browser als gar nichts
+        _log(logger, f"⚠️ {url}: Page-JSON nicht lesbar ({e!r}) – Fallback auf Playwright")
+        return None
+
+    return {
+        "url": url,
+        # h1 der Seite ist die Anzeige-Adresse
+        "title": address,
+        "price": price,
+        "address": address,
+        "description": description,
+        "bedrooms": bedrooms,
+        "bathrooms": bathrooms,
+        "property_type": property_type,
+        "floor_area_sqm": floor_area_sqm,
+        "year_built": year_built,
+        "energy_rating": energy_rating,
+        "refurb_intensity": refurb_intensity,
+        "source": source,
+    }
+
 
 # ----------------------------------------------------------
 # FETCH LISTINGS
@@ -511,42 +1299,30 @@ async def fetch_links(
     if logger is None:
         logger = print  # Fallback
 
-    pw, browser, page = await launch_browser(logger=logger)
-
-    logger(f"➡️ Fetching Rightmove listings for: {location}")
-
-    loc_id = "REGION^87490"  # London
-
-    links: List[str] = []
-
-    for p in range(max_pages):
-        url = f"{BASE}/property-for-sale/find.html?locationIdentifier={loc_id}&index={p * 24}"
+    links = await fetch_links_http(index_page_urls("property-for-sale", max_pages), logger)
+    if links is not None:
+        logger(f"➡️ {len(links)} Listings für {location} per HTTP geholt")
+        return links
 
-        logger(f"📄 Loading listing page: {url}")
-        try:
-            # etwas „leichteres“ wait_until + Timeout abfangen
-            await page.goto(url, timeout=70000, wait_until="domcontentloaded")
-        except PlaywrightTimeoutError as e:
-            logger(f"❌ Timeout loading listing page {url}: {e}")
-            # nächste Seite probieren, aber NICHT den ganzen Run crashen
-            continue
-
-        await accept_cookies(page)
-        await page.wait_for_timeout(2000)
-
-        cards = await page.query_selector_all("a.propertyCard-link")
+    context, page = await POOL.acquire(logger=logger)
+    try:
+        return await _fetch_links_on_page(page, location, max_pages, logger)
+    finally:
+        await POOL.release(context)
 
-        for c in cards:
-            href = await c.get_attribute("href")
-            if href and "/properties/" in href:
-                clean = BASE + href.split("?")[0]
-                links.append(clean)
 
-    await browser.close()
-    await pw.stop()
+async def _fetch_links_on_page(
+    page,
+    location: str,
+    max_pages: int,
+    logger: Logger,
+) -> List[str]:
+    logger(f"➡️ Fetching Rightmove listings for: {location}")
 
-    # dedupe
-    return list(set(links))
+    # locationIdentifier aktuell hardcoded für London
+    return await collect_index_links(
+        page, index_page_urls("property-for-sale", max_pages), logger
+    )
 
 
 # ----------------------------------------------------------
@@ -556,15 +1332,28 @@ async def scrape_property(url: str, logger: Optional[Logger] = None) -> Dict[str
     if logger is None:
         logger = print
 
-    pw, browser, page = await launch_browser(logger=logger)
+    key = (_scrape_property_page, url)
+    data = PROPERTY_CACHE.get(key)
+    if data is not None:
+        return data
+
+    data = await fetch_property_http(url, logger)
+    if data is None:
+        context, page = await POOL.acquire(logger=logger)
+        try:
+            data = await _scrape_property_page(page, url, logger)
+        finally:
+            await POOL.release(context)
+    PROPERTY_CACHE.put(key, data)
+    return data
 
+
+async def _scrape_property_page(page, url: str, logger: Logger) -> Dict[str, Any]:
     logger(f"🏠 Scraping: {url}")
     try:
-        await page.goto(url, timeout=70000, wait_until="domcontentloaded")
+        response = await page.goto(url, timeout=70000, wait_until="domcontentloaded")
     except PlaywrightTimeoutError as e:
         logger(f"❌ Timeout loading property page {url}: {e}")
-        await browser.close()
-        await pw.stop()
         # Fehler-Record zurückgeben, damit der Run weiterläuft
         return {
             "url": url,
@@ -578,8 +1367,8 @@ async def scrape_property(url: str, logger: Optional[Logger] = None) -> Dict[str
             "source": "v4.8_textparse_timeout",
             "error": f"timeout: {e}",
         }
-
-    await accept_cookies(page)
+    if response is not None and response.status == 429:
+        raise RateLimitedError(f"HTTP 429 for {url}")
 
     # Warten, bis zumindest der Title da ist
     try:
@@ -587,58 +1376,49 @@ async def scrape_property(url: str, logger: Optional[Logger] = None) -> Dict[str
     except Exception:
         pass
 
-    await page.wait_for_timeout(1500)
+    # TITLE & ADDRESS + Page-JSON
+    fields, prop_data = await extract_detail_page(page)
+    title = fields["title"]
+    address = fields["address"]
+
+    if prop_data:
+        (
+            price,
+            property_type,
+            bedrooms,
+            bathrooms,
+            description,
+            floor_area_sqm,
+            year_built,
+            energy_rating,
+            refurb_intensity,
+        ) = parse_property_data(prop_data)
+        address = address or (prop_data.get("address") or {}).get("displayAddress")
+    else:
+        # Fallback ohne Page-JSON: Lazy Load nur triggern, wenn die Description
+        # noch fehlt, dann Body-Text parsen
+        if not fields["description"]:
+            await scroll_and_settle(page)
+
+        body_text = await extract_detail_text(page)
 
-    # Scrollen, um Lazy Load zu triggern
-    try:
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await page.wait_for_timeout(1500)
-    except Exception:
-        pass
+        # Construction-Felder kommen unten aus extract_*, hier nur die Basisfelder
+        price, property_type, bedrooms, bathrooms, description = parse_listing_fields(body_text)
+
+        # Fallback Description direkt aus DOM
+        if not description:
+            description = fields["description"] or ""
 
-    # TITLE & ADDRESS
-    title = await safe_eval(page, "h1")
-    address = await safe_eval(page, "[data-testid='address']") \
-        or await safe_eval(page, "[data-testid='address-display']")
+        # ---------- NEU: Construction-Felder aus Text ----------
+        combined_text = f"{description}\n\n{body_text}"
+        floor_area_sqm = extract_floor_area_sqm(combined_text)
+        year_built = extract_year_built(combined_text)
+        energy_rating = extract_energy_rating(combined_text)
+        refurb_intensity = infer_refurb_intensity(combined_text)
 
     if not address and title:
         address = title
 
-    # BODY TEXT
-    try:
-        body_text = await page.inner_text("body")
-    except Exception:
-        body_text = ""
-
-    (
-    price,
-    property_type,
-    bedrooms,
-    bathrooms,
-    description,
-    floor_area_sqm,
-    year_built,
-    energy_rating,
-    refurb_intensity,
-) = parse_from_body_text(body_text)
-
-
-    # Fallback Description direkt aus DOM
-    if not description:
-        description = await safe_eval(page, "[data-testid='description']") \
-            or await safe_eval(page, "[data-testid='read-full-description']") \
-            or ""
-
-    # ---------- NEU: Construction-Felder aus Text ----------
-    combined_text = f"{description}\n\n{body_text}"
-    floor_area_sqm = extract_floor_area_sqm(combined_text)
-    year_built = extract_year_built(combined_text)
-    energy_rating = extract_energy_rating(combined_text)
-    refurb_intensity = infer_refurb_intensity(combined_text)
-
-    await browser.close()
-    await pw.stop()
-
     return {
         "url": url,
         "title": title,
@@ -652,11 +1432,391 @@ async def scrape_property(url: str, logger: Optional[Logger] = None) -> Dict[str
         "year_built": year_built,
         "energy_rating": energy_rating,
         "refurb_intensity": refurb_intensity,
-        "source": "v4.8_textparse_construction",
+        "source": "v4.8_pagemodel_construction" if prop_data else "v4.8_textparse_construction",
     }
 
 
 
+# ----------------------------------------------------------
+# Fan-out: Detailseiten parallel über einen Pool langlebiger Pages
+# ----------------------------------------------------------
+DEFAULT_MAX_CONCURRENCY = 5
+# Alle N Seiten Cookies des geteilten Contexts leeren (Tracking/Bot-Score)
+PAGE_RECYCLE_EVERY = 20
+# Versuche pro URL; Backoff zwischen Versuchen = 2**attempt * RETRY_BASE_DELAY
+SCRAPE_ATTEMPTS = 2
+RETRY_BASE_DELAY = 2.0
+
+
+class RateLimitedError(Exception):
+    """Detailseite kam mit HTTP 429 zurück."""
+
+
+class ScrapeError(Exception):
+    """Trägt die URL eines endgültig fehlgeschlagenen Workers nach außen."""
+
+    def __init__(self, url: str) -> None:
+        super().__init__(url)
+        self.url = url
+
+
+class AdaptiveThrottle:
+    """
+    Gemeinsame Pause vor jeder Navigation: startet bei 0, verdoppelt sich
+    bei 429/Timeout (bis max_delay) und schrumpft pro Erfolg um 10 %.
+    So läuft der Fan-out ungebremst, bis Rightmove bremst.
+    """
+
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 30.0) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.delay = 0.0
+
+    async def wait(self) -> None:
+        if self.delay > 0:
+            await asyncio.sleep(self.delay)
+
+    def on_success(self) -> None:
+        self.delay *= 0.9
+        if self.delay < 0.05:
+            self.delay = 0.0
+
+    def on_backoff(self) -> None:
+        self.delay = min(max(self.delay * 2, self.base_delay), self.max_delay)
+
+
+# Optionaler Platten-Cache über Prozessgrenzen hinweg (z.B. wiederholte
+# lokale Läufe): Pfad zu einer SQLite-Datei, leer = aus. Der Nightly-Run
+# lässt ihn aus, damit Preise nicht aus dem Vortag stammen.
+PROPERTY_CACHE_PATH = os.getenv("ESTATEAI_PROPERTY_CACHE") or None
+PROPERTY_CACHE_DISK_TTL = float(os.getenv("ESTATEAI_PROPERTY_CACHE_TTL", "86400"))
+# hochzählen, wenn sich das Zeilenformat ändert -> alte Einträge ignorieren
+PROPERTY_CACHE_VERSION = 1
+
+
+class PropertyCache:
+    """
+    Fertige Zeilen pro (scrape_page, url), damit dieselbe Immobilie im
+    selben Prozess nicht erneut geladen wird (Featured-Listings auf mehreren
+    Index-Seiten, wiederholte API-Aufrufe). Einträge verfallen nach ttl
+    Sekunden, über max_size fliegt der am längsten ungenutzte raus.
+    Fehler-Records werden nicht gecacht.
+
+    Mit path liegt dahinter zusätzlich eine SQLite-Datei (Zeilen als JSON,
+    Ablauf nach disk_ttl Sekunden Wandzeit), die auch spätere Läufe treffen.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600.0,
+        max_size: int = 10_000,
+        path: Optional[str] = None,
+        disk_ttl: float = PROPERTY_CACHE_DISK_TTL,
+    ) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self.disk_ttl = disk_ttl
+        self._items: "OrderedDict[Tuple[Any, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS property_cache "
+                "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, row TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def _disk_key(key: Tuple[Any, str]) -> str:
+        scrape_page, url = key
+        name = getattr(scrape_page, "__qualname__", None) or repr(scrape_page)
+        return f"v{PROPERTY_CACHE_VERSION}:{name}:{url}"
+
+    def _remember(self, key: Tuple[Any, str], row: Dict[str, Any]) -> None:
+        self._items[key] = (time.monotonic(), dict(row))
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def get(self, key: Tuple[Any, str]) -> Optional[Dict[str, Any]]:
+        hit = self._items.get(key)
+        if hit is not None:
+            stored_at, row = hit
+            if time.monotonic() - stored_at <= self.ttl:
+                self._items.move_to_end(key)
+                # Kopie: Konsumenten dürfen die Zeile verändern
+                return dict(row)
+            del self._items[key]
+        return self._get_disk(key)
+
+    def _get_disk(self, key: Tuple[Any, str]) -> Optional[Dict[str, Any]]:
+        if self._db is None:
+            return None
+        with self._db_lock:
+            found = self._db.execute(
+                "SELECT stored_at, row FROM property_cache WHERE key = ?",
+                (self._disk_key(key),),
+            ).fetchone()
+        if found is None or time.time() - found[0] > self.disk_ttl:
+            return None
+        try:
+            row = json.loads(found[1])
+        except ValueError:
+            return None
+        self._remember(key, row)
+        return row
+
+    def put(self, key: Tuple[Any, str], row: Dict[str, Any]) -> None:
+        if row.get("error"):
+            return
+        self._remember(key, row)
+        if self._db is None:
+            return
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO property_cache (key, stored_at, row) VALUES (?, ?, ?)",
+                (self._disk_key(key), time.time(), CHECKPOINT_ENCODER.encode(row)),
+            )
+            self._db.commit()
+
+    def clear(self) -> None:
+        self._items.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM property_cache")
+                self._db.commit()
+
+
+PROPERTY_CACHE = PropertyCache(path=PROPERTY_CACHE_PATH)
+
+
+def clear_property_cache() -> None:
+    """Erzwingt beim nächsten Lauf frische Detailseiten."""
+    PROPERTY_CACHE.clear()
+
+
+async def iter_scrape_urls(
+    links: List[str],
+    scrape_page: Callable[..., Awaitable[Dict[str, Any]]],
+    logger: Logger,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    tag: str = "",
+    block_assets: bool = BLOCK_ASSETS,
+    prefetch: Optional[Callable[..., Awaitable[Optional[Dict[str, Any]]]]] = None,
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Scrapt alle links mit höchstens max_concurrency gleichzeitigen Seiten
+    und liefert (index_in_links, zeile), sobald eine URL fertig ist
+    (as_completed statt gather: eine hängende Seite hält nichts auf).
+
+    prefetch(url, logger) (optional) ist der schnelle Weg ohne Browser;
+    liefert er None, kommt die URL auf eine Browser-Page; ein 429
+    (RateLimitedError) wird mit Backoff wiederholt statt im Browser. Context und
+    Pages entstehen erst beim ersten Bedarf – klappt prefetch für alle
+    URLs, wird Chromium gar nicht erst angefasst. Es gibt einen Context mit
+    höchstens max_concurrency Pages, die reihum neu navigiert werden
+    (Cookies und Cache bleiben warm). scrape_page(page, url, logger) scrapt
+    eine URL. Timeouts und 429 werden bis zu SCRAPE_ATTEMPTS-mal mit Backoff
+    wiederholt, die AdaptiveThrottle bremst dabei alle Worker gemeinsam.
+    Fehler werden geloggt und übersprungen.
+    """
+    if not links:
+        return
+
+    prefix = f"[{tag}] " if tag else ""
+    throttle = AdaptiveThrottle()
+    sem = asyncio.Semaphore(max_concurrency)
+
+    context = None
+    context_lock = asyncio.Lock()
+    idle_pages: List[Any] = []
+    served = 0
+
+    async def _get_page():
+        nonlocal context
+        async with context_lock:
+            if context is None:
+                context, page = await POOL.acquire(logger=logger, block_assets=block_assets)
+                return page
+        if idle_pages:
+            return idle_pages.pop()
+        return await context.new_page()
+
+    async def _scrape_in_browser(url: str) -> Dict[str, Any]:
+        nonlocal served
+        page = await _get_page()
+        try:
+            for attempt in range(SCRAPE_ATTEMPTS):
+                if page.is_closed():  # z.B. nach Renderer-Crash
+                    page = await context.new_page()
+                await throttle.wait()
+                last_attempt = attempt == SCRAPE_ATTEMPTS - 1
+                try:
+                    data = await scrape_page(page, url, logger)
+                except (PlaywrightTimeoutError, RateLimitedError) as e:
+                    if last_attempt:
+                        raise
+                    logger(f"🔁 {prefix}{url}: {e} – neuer Versuch")
+                else:
+                    # Timeout beim goto kommt als Fehler-Record zurück
+                    if not data.get("error"):
+                        throttle.on_success()
+                        break
+                    if last_attempt:
+                        break
+                    logger(f"🔁 {prefix}{url}: {data['error']} – neuer Versuch")
+                throttle.on_backoff()
+                await asyncio.sleep(2 ** attempt * RETRY_BASE_DELAY)
+        finally:
+            served += 1
+            if served % PAGE_RECYCLE_EVERY == 0:
+                try:
+                    await context.clear_cookies()
+                except Exception:
+                    pass
+            idle_pages.append(page)
+        return data
+
+    async def _prefetch_with_retry(url: str) -> Optional[Dict[str, Any]]:
+        # 429 auf dem HTTP-Weg: gleicher Backoff wie im Browser, nicht
+        # sofort Chromium auf denselben Host hetzen
+        for attempt in range(SCRAPE_ATTEMPTS):
+            await throttle.wait()
+            try:
+                return await prefetch(url, logger)
+            except RateLimitedError as e:
+                if attempt == SCRAPE_ATTEMPTS - 1:
+                    raise
+                logger(f"🔁 {prefix}{url}: {e} – neuer Versuch")
+            except Exception as e:
+                # z.B. geändertes Page-JSON: nicht verwerfen, Browser übernimmt
+                logger(f"⚠️ {prefix}{url}: HTTP-Weg fehlgeschlagen ({e!r}) – Fallback auf Playwright")
+                return None
+            throttle.on_backoff()
+            await asyncio.sleep(2 ** attempt * RETRY_BASE_DELAY)
+        return None
+
+    async def _one(idx: int, url: str) -> Tuple[int, Dict[str, Any]]:
+        cached = PROPERTY_CACHE.get((scrape_page, url))
+        if cached is not None:
+            return idx, cached
+        async with sem:
+            logger(f"➡️ {prefix}{idx + 1}/{len(links)} → {url}")
+            try:
+                data = None
+                if prefetch is not None:
+                    data = await _prefetch_with_retry(url)
+                if data is None:
+                    data = await _scrape_in_browser(url)
+                elif not data.get("error"):
+                    throttle.on_success()
+            except Exception as e:
+                raise ScrapeError(url) from e
+        PROPERTY_CACHE.put((scrape_page, url), data)
+        return idx, data
+
+    tasks = [asyncio.ensure_future(_one(idx, url)) for idx, url in enumerate(links)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                yield await next_done
+            except ScrapeError as e:
+                logger(f"❌ ERROR scraping {prefix}{e.url}: {e.__cause__}")
+    finally:
+        # Abbruch durch den Konsumenten: offene Navigationen nicht verwaisen lassen
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if context is not None:
+            await POOL.release(context)
+
+
+# ein Encoder für alle Checkpoint-Zeilen: json.dumps() mit eigenen kwargs
+# baut sonst pro Aufruf einen neuen JSONEncoder
+CHECKPOINT_ENCODER = json.JSONEncoder(ensure_ascii=False, default=str)
+
+
+def load_checkpoint(path: Optional[Path]) -> Dict[str, Dict[str, Any]]:
+    """Bereits gescrapte Zeilen (url -> zeile) aus einer .jsonl-Checkpoint-Datei."""
+    done: Dict[str, Dict[str, Any]] = {}
+    if path is None or not path.exists():
+        return done
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue  # halbe Zeile vom Absturz
+            if isinstance(row, dict) and row.get("url"):
+                done[row["url"]] = row
+    return done
+
+
+async def scrape_urls(
+    links: List[str],
+    scrape_page: Callable[..., Awaitable[Dict[str, Any]]],
+    logger: Logger,
+    queue: Optional[asyncio.Queue] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    tag: str = "",
+    checkpoint_path: Optional[Path] = None,
+    block_assets: bool = BLOCK_ASSETS,
+    prefetch: Optional[Callable[..., Awaitable[Optional[Dict[str, Any]]]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Listen-Adapter um iter_scrape_urls() (dort auch prefetch/block_assets).
+    Reihenfolge der Ergebnisse = Reihenfolge der links. queue bekommt jede
+    Zeile, sobald sie fertig ist.
+
+    checkpoint_path (optional): jede fehlerfreie Zeile wird sofort als JSON
+    an diese .jsonl angehängt; bei einem erneuten Lauf werden dort schon
+    vorhandene URLs nicht noch einmal gescrapt (Resume nach Absturz).
+    """
+    if checkpoint_path is not None:
+        checkpoint_path = Path(checkpoint_path)
+    done = load_checkpoint(checkpoint_path)
+    if done:
+        logger(f"♻️ {len(done)} URLs aus Checkpoint {checkpoint_path} übernommen")
+        if queue is not None:
+            for url in links:
+                if url in done:
+                    await queue.put(done[url])
+
+    todo = [url for url in links if url not in done]
+    fresh: Dict[str, Dict[str, Any]] = {}
+
+    checkpoint = None
+    if checkpoint_path is not None:
+        checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        checkpoint = checkpoint_path.open("a", encoding="utf-8")
+    try:
+        async for idx, data in iter_scrape_urls(
+            todo,
+            scrape_page,
+            logger,
+            max_concurrency=max_concurrency,
+            tag=tag,
+            block_assets=block_assets,
+            prefetch=prefetch,
+        ):
+            fresh[todo[idx]] = data
+            if checkpoint is not None and not data.get("error"):
+                checkpoint.write(CHECKPOINT_ENCODER.encode(data) + "\n")
+                checkpoint.flush()
+            if queue is not None:
+                await queue.put(data)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+    return [
+        fresh[url] if url in fresh else done[url]
+        for url in links
+        if url in fresh or url in done
+    ]
+
+
 # ----------------------------------------------------------
 # Complete Workflow: Listings → Property Details
 # ----------------------------------------------------------
@@ -664,24 +1824,31 @@ async def scrape_all(
     location: str = "London",
     pages: int = 1,
     logger: Optional[Logger] = None,
+    queue: Optional[asyncio.Queue] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    checkpoint_path: Optional[Path] = None,
 ) -> List[Dict[str, Any]]:
+    """
+    queue (optional): jede fertige Zeile wird zusätzlich hineingelegt, damit
+    ein Consumer (z.B. der Ingest in nightly_scrape) schon während des
+    Scrapes arbeiten kann. max_concurrency: gleichzeitig offene Detailseiten.
+    checkpoint_path (optional): .jsonl für Resume, siehe scrape_urls().
+    """
     if logger is None:
         logger = print
 
     links = await fetch_links(location, pages, logger=logger)
     logger(f"📦 {len(links)} listings found.")
 
-    results: List[Dict[str, Any]] = []
-
-    for idx, url in enumerate(links):
-        logger(f"➡️ {idx + 1}/{len(links)} → {url}")
-        try:
-            data = await scrape_property(url, logger=logger)
-            results.append(data)
-        except Exception as e:
-            logger(f"❌ ERROR scraping {url}: {e}")
-
-    return results
+    return await scrape_urls(
+        links,
+        _scrape_property_page,
+        logger,
+        queue=queue,
+        max_concurrency=max_concurrency,
+        prefetch=fetch_property_http,
+        checkpoint_path=checkpoint_path,
+    )
 
 
 # ----------------------------------------------------------
@@ -695,58 +1862,62 @@ async def fetch_rental_links(
     if logger is None:
         logger = print
 
-    pw, browser, page = await launch_browser(logger=logger)
+    links = await fetch_links_http(index_page_urls("property-to-rent", max_pages), logger)
+    if links is not None:
+        logger(f"➡️ {len(links)} RENT-Listings für {location} per HTTP geholt")
+        return links
 
-    logger(f"➡️ Fetching Rightmove *rental* listings for: {location}")
-
-    loc_id = "REGION^87490"  # London
-
-    links: List[str] = []
-
-    for p in range(max_pages):
-        url = f"{BASE}/property-to-rent/find.html?locationIdentifier={loc_id}&index={p * 24}"
-
-        logger(f"📄 Loading RENT listing page: {url}")
-        await page.goto(url, timeout=70000)
-        await accept_cookies(page)
-        await page.wait_for_timeout(2000)
-
-        cards = await page.query_selector_all("a.propertyCard-link")
+    context, page = await POOL.acquire(logger=logger)
+    try:
+        return await _fetch_rental_links_on_page(page, location, max_pages, logger)
+    finally:
+        await POOL.release(context)
 
-        for c in cards:
-            href = await c.get_attribute("href")
-            if href and "/properties/" in href:
-                clean = BASE + href.split("?")[0]
-                links.append(clean)
 
-    await browser.close()
-    await pw.stop()
+async def _fetch_rental_links_on_page(
+    page,
+    location: str,
+    max_pages: int,
+    logger: Logger,
+) -> List[str]:
+    logger(f"➡️ Fetching Rightmove *rental* listings for: {location}")
 
-    return list(set(links))
+    # locationIdentifier aktuell hardcoded für London
+    return await collect_index_links(
+        page, index_page_urls("property-to-rent", max_pages), logger, label="RENT listing"
+    )
 
 
 async def scrape_all_rentals(
     location: str = "London",
     pages: int = 1,
     logger: Optional[Logger] = None,
+    queue: Optional[asyncio.Queue] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    checkpoint_path: Optional[Path] = None,
 ) -> List[Dict[str, Any]]:
+    """
+    queue (optional): jede fertige Zeile wird zusätzlich hineingelegt, damit
+    ein Consumer (z.B. der Ingest in nightly_scrape) schon während des
+    Scrapes arbeiten kann. max_concurrency: gleichzeitig offene Detailseiten.
+    checkpoint_path (optional): .jsonl für Resume, siehe scrape_urls().
+    """
     if logger is None:
         logger = print
 
     links = await fetch_rental_links(location, pages, logger=logger)
     logger(f"📦 [RENT] {len(links)} rental listings found.")
 
-    results: List[Dict[str, Any]] = []
-
-    for idx, url in enumerate(links):
-        logger(f"➡️ [RENT] {idx + 1}/{len(links)} → {url}")
-        try:
-            data = await scrape_property(url, logger=logger)
-            results.append(data)
-        except Exception as e:
-            logger(f"❌ ERROR scraping RENT {url}: {e}")
-
-    return results
+    return await scrape_urls(
+        links,
+        _scrape_property_page,
+        logger,
+        queue=queue,
+        max_concurrency=max_concurrency,
+        prefetch=fetch_property_http,
+        tag="RENT",
+        checkpoint_path=checkpoint_path,
+    )
 
 
 # ----------------------------------------------------------
@@ -756,13 +1927,33 @@ def scrape_all_sync(
     location: str = "London",
     pages: int = 1,
     logger: Optional[Logger] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    checkpoint_path: Optional[Path] = None,
 ) -> List[Dict[str, Any]]:
-    return asyncio.run(scrape_all(location, pages, logger=logger))
+    return run_sync(
+        scrape_all(
+            location,
+            pages,
+            logger=logger,
+            max_concurrency=max_concurrency,
+            checkpoint_path=checkpoint_path,
+        )
+    )
 
 
 def scrape_all_rentals_sync(
     location: str = "London",
     pages: int = 1,
     logger: Optional[Logger] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    checkpoint_path: Optional[Path] = None,
 ) -> List[Dict[str, Any]]:
-    return asyncio.run(scrape_all_rentals(location, pages, logger=logger))
\ No newline at end of file
+    return run_sync(
+        scrape_all_rentals(
+            location,
+            pages,
+            logger=logger,
+            max_concurrency=max_concurrency,
+            checkpoint_path=checkpoint_path,
+        )
+    )
\ No newline at end of file
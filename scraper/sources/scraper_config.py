@@ -9,4 +9,6 @@ SCRAPER_SETTINGS = {
     "VIEWPORT": {"width": 1600, "height": 1000},
     "LOCALE": "en-GB",
     "TIMEZONE": "Europe/London",
+    # Bilder/Fonts/CSS/Tracking im Browser abbrechen (Scraper brauchen nur Text)
+    "BLOCK_ASSETS": True,
 }
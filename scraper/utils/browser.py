@@ -1,26 +1,39 @@
 import asyncio
-from playwright.async_api import async_playwright
 from scraper.sources.scraper_config import SCRAPER_SETTINGS
+from scraper.sources.rightmove_scraper import (
+    CONTEXT_INIT_SCRIPT,
+    POOL,
+    _start_chromium,
+    block_assets_route,
+)
 
 
 class BrowserFactory:
+    """
+    Headless: Page aus dem warmen BrowserPool (ein Chromium pro Event-Loop,
+    kein Kaltstart pro Nutzung); beim Verlassen wird nur der Context
+    geschlossen. Den Pool-Browser selbst schließt der Pool, wenn der Loop
+    endet (asyncio.run()); bei selbst verwalteten Loops vorher
+    POOL.shutdown() aufrufen. headless=False (Debugging) startet einen
+    eigenen Browser und schließt ihn beim Verlassen.
+    """
+
     def __init__(self, headless=True):
         self.headless = headless
         self.browser = None
+        self.context = None
         self.page = None
         self.pw = None
 
     async def __aenter__(self):
-        self.pw = await async_playwright().start()
-
-        self.browser = await self.pw.chromium.launch(
-            headless=self.headless,
-            args=[
-                "--disable-web-security",
-                "--disable-blink-features=AutomationControlled",
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-            ],
+        if self.headless:
+            self.context, self.page = await POOL.acquire(
+                block_assets=SCRAPER_SETTINGS.get("BLOCK_ASSETS", True)
+            )
+            return self.page
+
+        self.pw, self.browser = await _start_chromium(
+            headless=self.headless, extra_args=("--no-sandbox",)
         )
 
         context = await self.browser.new_context(
@@ -30,11 +43,19 @@ class BrowserFactory:
             locale=SCRAPER_SETTINGS["LOCALE"],
             timezone_id=SCRAPER_SETTINGS["TIMEZONE"],
         )
+        await context.add_init_script(CONTEXT_INIT_SCRIPT)
+        if SCRAPER_SETTINGS.get("BLOCK_ASSETS", True):
+            await context.route("**/*", block_assets_route)
 
         self.page = await context.new_page()
         return self.page
 
     async def __aexit__(self, exc_type, exc, tb):
+        if self.context is not None:
+            await POOL.release(self.context)
+            self.context = None
+            return
+
         try:
             if self.browser:
                 await self.browser.close()
@@ -1,10 +1,43 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+
 import pytesseract
 from PIL import Image
 
-def extract_text_from_image(path: str) -> str:
+# Breiter bringt Tesseract keine Genauigkeit mehr, kostet aber linear Pixel
+OCR_MAX_WIDTH = 2000
+
+
+def _prepare_image(img: Image.Image) -> Image.Image:
+    """Graustufen + auf OCR_MAX_WIDTH verkleinern (Seitenverhältnis bleibt)."""
+    if img.mode != "L":
+        img = img.convert("L")
+    if img.width > OCR_MAX_WIDTH:
+        height = max(1, round(img.height * OCR_MAX_WIDTH / img.width))
+        img = img.resize((OCR_MAX_WIDTH, height), Image.LANCZOS)
+    return img
+
+
+def extract_text_from_image(path: str, config: str = "") -> str:
     try:
-        img = Image.open(path)
-        text = pytesseract.image_to_string(img, lang="eng")
+        img = _prepare_image(Image.open(path))
+        text = pytesseract.image_to_string(img, lang="eng", config=config)
         return text
     except Exception as e:
         return f"OCR_ERROR: {str(e)}"
+
+
+async def extract_text_from_image_async(path: str, config: str = "") -> str:
+    """Wie extract_text_from_image(), ohne den Event-Loop zu blockieren."""
+    return await asyncio.to_thread(extract_text_from_image, path, config)
+
+
+def extract_texts(paths: Iterable[str], config: str = "") -> List[str]:
+    """
+    OCR für mehrere Bilder parallel. Threads reichen: die eigentliche Arbeit
+    macht der tesseract-Subprozess, Python wartet nur auf dessen Ausgabe.
+    """
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        return list(executor.map(lambda p: extract_text_from_image(p, config), paths))
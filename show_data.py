@@ -1,6 +1,8 @@
 import sqlite3
 from textwrap import shorten
 
+FETCH_BATCH = 64
+
 
 def main(limit: int = 10):
     # Verbindung zur SQLite-Datenbank
@@ -25,39 +27,46 @@ def main(limit: int = 10):
         (limit,),
     )
 
-    rows = cur.fetchall()
+    # Zeilen in Batches statt fetchall(): bei großem limit liegen nie alle
+    # Descriptions gleichzeitig im Speicher
+    shown = 0
+    while batch := cur.fetchmany(FETCH_BATCH):
+        for row in batch:
+            if shown == 0:
+                print("\nShowing top listings by price:\n")
+            shown += 1
+            _print_listing(row)
 
-    if not rows:
+    if not shown:
         print("No listings found in the database.")
-        conn.close()
-        return
+    else:
+        print(f"({shown} listings shown)")
 
-    print(f"\nShowing top {len(rows)} listings by price:\n")
+    conn.close()
 
-    for row in rows:
-        (
-            listing_id,
-            url,
-            price,
-            bedrooms,
-            bathrooms,
-            property_type,
-            description,
-        ) = row
 
-        print("-" * 80)
-        print(f"ID:          {listing_id}")
-        print(f"URL:         {url}")
-        print(f"Price (GBP): {price:,.0f}" if price is not None else "Price:       n/a")
-        print(f"Bedrooms:    {bedrooms}")
-        print(f"Bathrooms:   {bathrooms}")
-        print(f"Type:        {property_type}")
-        print("\nDescription:")
-        short_desc = shorten((description or "").replace("\n", " "), width=300, placeholder="...")
-        print(short_desc)
-        print()
+def _print_listing(row) -> None:
+    (
+        listing_id,
+        url,
+        price,
+        bedrooms,
+        bathrooms,
+        property_type,
+        description,
+    ) = row
 
-    conn.close()
+    print("-" * 80)
+    print(f"ID:          {listing_id}")
+    print(f"URL:         {url}")
+    print(f"Price (GBP): {price:,.0f}" if price is not None else "Price:       n/a")
+    print(f"Bedrooms:    {bedrooms}")
+    print(f"Bathrooms:   {bathrooms}")
+    print(f"Type:        {property_type}")
+    print("\nDescription:")
+    short_desc = shorten((description or "").replace("\n", " "), width=300, placeholder="...")
+    print(short_desc)
+    print()
 
 
 if __name__ == "__main__":
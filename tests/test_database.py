@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Eigener Prozess: database.connection baut Engine + init_db() beim Import,
+# nur so landet alles in der temporären DB statt in estateai.db
+RESTART_SCRIPT = """
+from database.connection import init_db, get_session
+from database.ingest import ingest_bulk_results
+from database import models
+from pipelines.build_rent_benchmarks import build_rent_benchmarks
+
+# zweiter Start auf derselben DB (Migration + Ausdrucks-Index)
+init_db()
+
+rows = [
+    {"url": f"https://example.com/properties/{i}", "price": f"£{1500 + i * 100} pcm",
+     "bedrooms": "2", "address": f"{i} Test Street", "floor_area_sqm": 50.0 + i}
+    for i in range(3)
+]
+ingest_bulk_results(rows, portal="rightmove", location_query="test", listing_type="rent")
+
+first = build_rent_benchmarks(min_listings_per_bucket=1)
+second = build_rent_benchmarks(min_listings_per_bucket=1)
+
+with get_session() as session:
+    buckets = session.query(models.RentBenchmark).count()
+
+assert first == second == 1, (first, second)
+assert buckets == 1, buckets
+"""
+
+
+def _run_in_temp_db(tmp_path, script: str) -> None:
+    env = dict(
+        os.environ,
+        ESTATEAI_DATABASE_URL=f"sqlite:///{tmp_path / 'test.db'}",
+        ESTATEAI_BLOB_DIR=str(tmp_path / "blobs"),
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_init_db_and_rent_benchmarks_are_rerunnable(tmp_path):
+    for _ in range(2):
+        _run_in_temp_db(tmp_path, RESTART_SCRIPT)
+
+
+DENORM_SCRIPT = """
+from database.connection import get_session
+from database.ingest import ingest_bulk_results
+from database import models
+
+ingest_bulk_results([{"url": "https://example.com/u0", "address": "1 A St"}],
+                    portal="rightmove", location_query="test")
+# u1 ohne Fläche, u2 ergänzt die bestehende Property im selben Batch
+ingest_bulk_results(
+    [
+        {"url": "https://example.com/u1", "address": "1 A St"},
+        {"url": "https://example.com/u2", "address": "1 A St", "floor_area_sqm": 50.0},
+    ],
+    portal="rightmove",
+    location_query="test",
+)
+
+with get_session() as session:
+    prop = session.query(models.Property).filter_by(full_address="1 A St").one()
+    prop_area = prop.floor_area_sqm
+    areas = {l.url[-2:]: l.floor_area_sqm for l in session.query(models.Listing)}
+
+assert prop_area == 50.0, prop_area
+assert areas == {"u0": 50.0, "u1": 50.0, "u2": 50.0}, areas
+"""
+
+
+def test_listings_mirror_property_filled_later_in_batch(tmp_path):
+    _run_in_temp_db(tmp_path, DENORM_SCRIPT)
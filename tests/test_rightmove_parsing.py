@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from scraper.sources.rightmove_scraper import parse_property_data, property_data_from_html
+
+DOM_DUMP = Path(__file__).resolve().parents[1] / "scraper" / "debug" / "rightmove_dom_dump.html"
+
+
+def test_property_data_from_saved_detail_page():
+    prop = property_data_from_html(DOM_DUMP.read_text(encoding="utf-8"))
+    assert prop is not None
+    assert prop["address"]["displayAddress"] == "One Hyde Park, Knightsbridge, London, SW1X"
+
+    (
+        price,
+        property_type,
+        bedrooms,
+        bathrooms,
+        description,
+        floor_area_sqm,
+        year_built,
+        energy_rating,
+        refurb_intensity,
+    ) = parse_property_data(prop)
+
+    assert price == "£60,000,000"
+    assert property_type == "Apartment"
+    assert bedrooms == "5"
+    assert bathrooms == "5"
+    assert floor_area_sqm == 836.0
+    assert description
+    assert year_built is None
+    assert energy_rating is None
+    assert refurb_intensity == "none"
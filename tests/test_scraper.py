@@ -1,18 +1,28 @@
 import pytest
+import pytest_asyncio
 import asyncio
-from scraper.sources.rightmove_scraper import fetch_links, scrape_expose
+from scraper.sources.rightmove_scraper import fetch_links, scrape_property
 
+# Ein Event-Loop für das ganze Modul: POOL hält einen Chromium pro Loop,
+# so bootet der Browser nur einmal statt pro Test
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
-@pytest.mark.asyncio
-async def test_fetch_links():
-    links = await fetch_links(max_pages=1)
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def links():
+    return await fetch_links(max_pages=1)
+
+
+async def test_fetch_links(links):
     assert isinstance(links, list)
     assert len(links) > 0
 
 
-@pytest.mark.asyncio
-async def test_scrape_single():
-    links = await fetch_links(max_pages=1)
-    data = await scrape_expose(links[0])
-    assert data.url.startswith("https://")
-    assert data.source in ("dom", "ocr")
+async def test_scrape_single(links):
+    data = await scrape_property(links[0])
+    assert data["url"].startswith("https://")
+    assert data["source"] in (
+        "v4.8_http_pagemodel",
+        "v4.8_pagemodel_construction",
+        "v4.8_textparse_construction",
+    )